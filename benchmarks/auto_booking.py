@@ -0,0 +1,92 @@
+"""Measure match-to-booking latency of auto-booking monitors against the stub booking endpoint.
+
+Every round searches for slots and books the earliest one, either over the pooled connection the search has just
+used or over a fresh client, as a booking made after a separate sign-in would. Run with
+``python -m benchmarks.auto_booking``.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import date
+from itertools import count
+
+from httpx import AsyncClient
+
+from benchmarks.stub_server import (
+    StubHandler,
+    StubRequest,
+    StubServer,
+    StubTransport,
+    booking_handler,
+    generate_slot_items,
+)
+from src.medicover_client.api_urls import AVAILABLE_SLOT_SEARCH_URL, BASE_URL, BOOK_APPOINTMENT_URL
+from src.medicover_client.client import MedicoverClient
+from src.monitoring.booking import book_first_available
+from src.monitoring.metrics import LatencyStats
+
+SLOTS_PATH = AVAILABLE_SLOT_SEARCH_URL.removeprefix(BASE_URL)
+BOOKING_PATH = BOOK_APPOINTMENT_URL.removeprefix(BASE_URL)
+
+
+def fresh_slots_handler(slot_count: int) -> StubHandler:
+    """Answers every search with slots that have not been booked yet."""
+    items = generate_slot_items(slot_count)
+    searches = count()
+
+    def handler(request: StubRequest) -> tuple[int, bytes]:
+        search = next(searches)
+        return 200, json.dumps(
+            {"items": [{**item, "bookingString": f"{item['bookingString']}-{search}"} for item in items]}
+        ).encode()
+
+    return handler
+
+
+def connect(server: StubServer) -> MedicoverClient:
+    client = MedicoverClient("benchmark", "benchmark")
+    client._http_client = AsyncClient(transport=StubTransport(server.url))
+    # A token without an expiry claim counts as valid, so the client never tries to sign in.
+    client._token = "benchmark"
+    return client
+
+
+async def run(server: StubServer, rounds: int, pooled: bool) -> LatencyStats:
+    latency = LatencyStats()
+    search_client = connect(server)
+    async with search_client:
+        for _ in range(rounds):
+            slots = await search_client.get_available_slots("1", "9", date(2030, 1, 1))
+            matched_at = time.perf_counter()
+
+            if pooled:
+                booked_slot = await book_first_available(search_client, slots, matched_at)
+            else:
+                async with connect(server) as booking_client:
+                    booked_slot = await book_first_available(booking_client, slots, matched_at)
+
+            if booked_slot is None:
+                raise AssertionError("No slot was booked.")
+            latency.record(time.perf_counter() - matched_at)
+
+    return latency
+
+
+async def main(rounds: int, slot_count: int, latency: float) -> None:
+    for name, pooled in (("fresh booking client", False), ("pooled client", True)):
+        routes = {SLOTS_PATH: fresh_slots_handler(slot_count), BOOKING_PATH: booking_handler()}
+        async with StubServer(routes, latency=latency) as server:
+            stats = await run(server, rounds, pooled)
+            print(f"{name:>20}: {stats.summary()}, {server.connections} connections for {server.requests} requests")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--slots", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="Artificial server latency in seconds")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rounds, args.slots, args.latency))
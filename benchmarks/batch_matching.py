@@ -0,0 +1,70 @@
+"""Match many monitor windows against one slot response, one window at a time and as a vectorized batch.
+
+Run with ``python -m benchmarks.batch_matching``; the batch variant needs the ``vectorized`` extra.
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from datetime import time as day_time
+
+from benchmarks.stub_server import generate_slot_items
+from src.medicover_client import matching
+from src.medicover_client.slots import Slot, SlotWindow
+
+
+def generate_windows(count: int, seed: int) -> list[SlotWindow]:
+    generator = random.Random(seed)
+    windows = []
+    for _ in range(count):
+        from_hour = generator.randint(6, 14)
+        windows.append(
+            SlotWindow(
+                to_date=date(2030, 1, 1) + timedelta(days=generator.randint(0, 60)),
+                from_time=day_time(hour=from_hour, minute=generator.choice((0, 15, 30, 45))),
+                to_time=day_time(hour=generator.randint(from_hour + 1, 23)),
+            )
+        )
+    return windows
+
+
+def match_one_by_one(slots: list[Slot], windows: list[SlotWindow]) -> list[list[Slot]]:
+    return [window.filter(slots) for window in windows]
+
+
+def measure(
+    name: str,
+    match: Callable[[list[Slot], list[SlotWindow]], list[list[Slot]]],
+    slots: list[Slot],
+    windows: list[SlotWindow],
+) -> list[list[Slot]]:
+    started = time.perf_counter()
+    matches = match(slots, windows)
+    elapsed = time.perf_counter() - started
+
+    print(f"{name:>12}: {elapsed * 1000:.1f}ms, {sum(len(matched) for matched in matches)} matches")
+    return matches
+
+
+def main(slot_count: int, monitor_count: int) -> None:
+    slots = [Slot.from_item(item) for item in generate_slot_items(slot_count)]
+    windows = generate_windows(monitor_count, seed=slot_count)
+    print(f"{slot_count} slots x {monitor_count} monitors")
+
+    expected = measure("one by one", match_one_by_one, slots, windows)
+    if matching.np is None:
+        print("numpy is not installed, skipping the vectorized matcher")
+        return
+    if measure("vectorized", matching.match_windows, slots, windows) != expected:
+        raise AssertionError("The vectorized matcher disagrees with SlotWindow.filter.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--slots", type=int, default=5000)
+    parser.add_argument("--monitors", type=int, default=1000)
+    args = parser.parse_args()
+
+    main(args.slots, args.monitors)
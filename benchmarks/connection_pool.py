@@ -0,0 +1,65 @@
+"""Compare a fresh AsyncClient per request with the pooled client owned by MedicoverClient.
+
+Run with ``python -m benchmarks.connection_pool``.
+"""
+
+import argparse
+import asyncio
+import time
+
+from httpx import AsyncClient
+
+from benchmarks.stub_server import StubServer, generate_slot_items, json_handler
+from src.medicover_client.api_urls import AVAILABLE_SLOT_SEARCH_URL, BASE_URL
+from src.medicover_client.client import MedicoverClient
+
+SLOTS_PATH = AVAILABLE_SLOT_SEARCH_URL.removeprefix(BASE_URL)
+
+
+async def run_fresh_clients(url: str, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch() -> None:
+        async with semaphore, AsyncClient() as client:
+            response = await client.get(url)
+            response.raise_for_status()
+
+    await asyncio.gather(*(fetch() for _ in range(requests)))
+
+
+async def run_pooled_client(url: str, requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with MedicoverClient("benchmark", "benchmark") as medicover_client:
+
+        async def fetch() -> None:
+            async with semaphore:
+                response = await medicover_client.http_client.get(url)
+                response.raise_for_status()
+
+        await asyncio.gather(*(fetch() for _ in range(requests)))
+
+
+async def main(requests: int, concurrency: int, latency: float) -> None:
+    routes = {SLOTS_PATH: json_handler({"items": generate_slot_items(20)})}
+
+    for name, runner in (("fresh client per request", run_fresh_clients), ("pooled client", run_pooled_client)):
+        async with StubServer(routes, latency=latency) as server:
+            started = time.perf_counter()
+            await runner(server.url + SLOTS_PATH, requests, concurrency)
+            elapsed = time.perf_counter() - started
+
+            print(
+                f"{name:>26}: {elapsed:.3f}s total, {elapsed / requests * 1000:.2f}ms/request, "
+                f"{server.connections} connections for {server.requests} requests"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="Artificial server latency in seconds")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.concurrency, args.latency))
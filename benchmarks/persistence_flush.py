@@ -0,0 +1,142 @@
+"""Compare how long one persistence update takes with PicklePersistence and SQLitePersistence.
+
+Both stores start out holding ``--users`` users, after which ``--changed`` of them are updated the way
+``Application.update_persistence`` does it. For SQLitePersistence the time until the rows are on disk is reported
+separately from the time the event loop is blocked. Run with ``python -m benchmarks.persistence_flush``.
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from copy import deepcopy
+from pathlib import Path
+from typing import Any
+
+from telegram.ext import BasePersistence, PersistenceInput, PicklePersistence
+
+from src.monitoring.seen import SeenSlots
+from src.telegram_interface.persistence import SQLitePersistence
+
+STORE_DATA = PersistenceInput(callback_data=False)
+
+Data = dict[Any, Any]
+
+
+def generate_user_data(user_id: int) -> Data:
+    seen = SeenSlots()
+    for index in range(50):
+        seen.add(f"{1000 + index}:{100 + index % 12}:{user_id + index * 15}")
+
+    return {
+        "medicover_client": None,
+        "history": {
+            "locations": [{"location_id": str(index), "location_name": f"City {index}"} for index in range(5)],
+            "specializations": [
+                {"specialization_id": str(index), "specialization_name": f"Specialty {index}"} for index in range(5)
+            ],
+            "clinics": {},
+            "doctors": {},
+            "temp_data": {},
+        },
+        "bookings": {
+            number: {
+                "location": {"location_id": "1", "location_name": "City 1"},
+                "specialization": {"specialization_id": "9", "specialization_name": "Specialty 9"},
+                "from_date": {"day": 1, "month": 1, "year": 2030},
+                "to_date": {"day": 28, "month": 2, "year": 2030},
+                "booking_hash": f"{user_id:08x}{number:024x}",
+            }
+            for number in range(3)
+        },
+        "current_booking_number": 2,
+        "booking_hashes": {f"{user_id:08x}{number:024x}": number for number in range(3)},
+        "monitors": {
+            f"{user_id:08x}{number:024x}": {
+                "monitor_id": f"{user_id:08x}{number:024x}",
+                "chat_id": user_id,
+                "user_id": user_id,
+                "booking_number": number,
+                "created_at": "2030-01-01T00:00:00",
+                "seen": seen,
+                "auto_book": False,
+            }
+            for number in range(3)
+        },
+        "language": "en",
+        "username": f"user{user_id}",
+        "password": "password",
+    }
+
+
+async def update(
+    persistence: BasePersistence[Data, Data, Data], user_data: dict[int, Data], changed: list[int]
+) -> None:
+    for user_id in changed:
+        await persistence.update_user_data(user_id, deepcopy(user_data[user_id]))
+
+
+async def measure_pickle(path: Path, user_data: dict[int, Data], changed: list[int]) -> None:
+    seed: PicklePersistence[Data, Data, Data] = PicklePersistence(path, store_data=STORE_DATA, on_flush=True)
+    await update(seed, user_data, list(user_data))
+    await seed.flush()
+
+    # The bot used PicklePersistence with the default on_flush=False, which dumps the whole file on every update.
+    persistence: PicklePersistence[Data, Data, Data] = PicklePersistence(path, store_data=STORE_DATA)
+    await persistence.get_user_data()
+
+    started = time.perf_counter()
+    await update(persistence, user_data, changed)
+    elapsed = time.perf_counter() - started
+    print(f"{'PicklePersistence':>18}: {elapsed * 1000:.1f}ms blocking")
+
+
+async def measure_sqlite(path: Path, user_data: dict[int, Data], changed: list[int]) -> None:
+    seed = SQLitePersistence(path, store_data=STORE_DATA)
+    await seed.get_user_data()
+    await update(seed, user_data, list(user_data))
+    await seed.flush()
+
+    persistence = SQLitePersistence(path, store_data=STORE_DATA)
+    await persistence.get_user_data()
+
+    started = time.perf_counter()
+    await update(persistence, user_data, changed)
+    blocking = time.perf_counter() - started
+    await persistence.drain()
+    written = time.perf_counter() - started - persistence.write_delay
+    await persistence.flush()
+    print(f"{'SQLitePersistence':>18}: {blocking * 1000:.1f}ms blocking, {written * 1000:.1f}ms until written")
+
+
+async def measure_migration(pickle_path: Path, database_path: Path, users: int) -> None:
+    persistence = SQLitePersistence(database_path, migrate_from=pickle_path, store_data=STORE_DATA)
+    started = time.perf_counter()
+    migrated = await persistence.get_user_data()
+    elapsed = time.perf_counter() - started
+    await persistence.flush()
+    if len(migrated) != users:
+        raise AssertionError(f"Migrated {len(migrated)} of {users} users.")
+    print(f"{'migration':>18}: {elapsed * 1000:.1f}ms for {users} users")
+
+
+async def main(users: int, changed_users: int) -> None:
+    user_data = {user_id: generate_user_data(user_id) for user_id in range(users)}
+    changed = random.Random(users).sample(list(user_data), changed_users)
+    print(f"{changed_users} of {users} users changed")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_path = Path(directory) / "persistence.pickle"
+        await measure_pickle(pickle_path, user_data, changed)
+        await measure_sqlite(Path(directory) / "persistence.sqlite3", user_data, changed)
+        await measure_migration(pickle_path, Path(directory) / "migrated.sqlite3", users)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--changed", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.users, args.changed))
@@ -0,0 +1,62 @@
+"""Decode time and peak memory of a 5000-item slot page with the stdlib and the msgspec decoders.
+
+Run with ``python -m benchmarks.slot_decoding``; the msgspec variant needs the ``fast-json`` extra.
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import cast
+
+from benchmarks.stub_server import generate_slot_items
+from src.medicover_client.slots import Slot
+from src.medicover_client.types import SlotItem
+
+try:
+    from src.medicover_client import structs
+except ImportError:
+    structs = None  # type: ignore[assignment]
+
+
+def decode_with_stdlib(content: bytes) -> list[Slot]:
+    return [Slot.from_item(item) for item in cast(list[SlotItem], json.loads(content)["items"])]
+
+
+def measure(name: str, decode: Callable[[bytes], list[Slot]], content: bytes, rounds: int) -> None:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        decode(content)
+    elapsed = (time.perf_counter() - started) / rounds
+
+    tracemalloc.start()
+    decode(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name:>8}: {elapsed * 1000:.2f}ms per page, peak {peak / 1024 / 1024:.2f}MiB")
+
+
+def main(items: int, rounds: int) -> None:
+    # Real responses carry fields the monitors never read.
+    extra_fields = {"isOverbooking": False, "languages": [{"id": 1, "name": "Polski"}], "sysVisitTypeId": 1}
+    page_items = [{**item, **extra_fields} for item in generate_slot_items(items)]
+    content = json.dumps({"items": page_items, "totalCount": items}).encode()
+
+    print(f"{items} slots, {len(content) / 1024:.0f}KiB payload")
+    measure("stdlib", decode_with_stdlib, content, rounds)
+
+    if structs is None:
+        print("msgspec is not installed, skipping the typed decoder")
+        return
+    measure("msgspec", lambda data: list(structs.decode_slots(data)), content, rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    main(args.items, args.rounds)
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import ssl
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import httpx
+
+from src.medicover_client.types import SlotItem
+
+
+class StubRequest(NamedTuple):
+    method: str
+    path: str
+    query: str
+    headers: dict[str, str]
+    body: bytes
+
+
+StubHandler = Callable[[StubRequest], tuple[int, bytes]]
+
+
+def generate_slot_items(count: int, start: datetime | None = None) -> list[SlotItem]:
+    start = start or datetime(2030, 1, 1, 7, 0)
+    items: list[SlotItem] = []
+    for index in range(count):
+        appointment_date = start + timedelta(minutes=15 * index)
+        items.append(
+            {
+                "appointmentDate": appointment_date.isoformat(),
+                "bookingString": f"booking-{index:06d}",
+                "clinic": {"id": str(100 + index % 12), "name": f"Clinic {index % 12}"},
+                "doctor": {"id": str(1000 + index % 40), "name": f"Doctor {index % 40}"},
+                "specialty": {"id": "9", "name": "Internal medicine"},
+                "visitType": "Center",
+            }
+        )
+    return items
+
+
+def json_handler(payload: object) -> StubHandler:
+    body = json.dumps(payload).encode()
+
+    def handler(request: StubRequest) -> tuple[int, bytes]:
+        return 200, body
+
+    return handler
+
+
+def booking_handler() -> StubHandler:
+    """Books every booking string once and answers 409 for a slot that is already taken, like the real endpoint."""
+    booked: set[str] = set()
+
+    def handler(request: StubRequest) -> tuple[int, bytes]:
+        booking_string = json.loads(request.body)["bookingString"]
+        if booking_string in booked:
+            return 409, b"{}"
+        booked.add(booking_string)
+        return 200, json.dumps({"appointmentId": f"appointment-{len(booked)}"}).encode()
+
+    return handler
+
+
+class StubTransport(httpx.AsyncHTTPTransport):
+    """Sends requests for the absolute Medicover URLs used by ``MedicoverClient`` to a stub server instead."""
+
+    def __init__(self, server_url: str) -> None:
+        super().__init__()
+        self.server_url = httpx.URL(server_url)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(
+            scheme=self.server_url.scheme, host=self.server_url.host, port=self.server_url.port
+        )
+        return await super().handle_async_request(request)
+
+
+class StubServer:
+    """Minimal HTTP/1.1 keep-alive server standing in for the Medicover API in benchmarks."""
+
+    def __init__(self, routes: dict[str, StubHandler], latency: float = 0.0) -> None:
+        self.routes = routes
+        self.latency = latency
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+        self._scheme = "http"
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Server is not running.")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"{self._scheme}://{host}:{port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, ssl_context: ssl.SSLContext | None = None) -> None:
+        self._scheme = "https" if ssl_context else "http"
+        self._server = await asyncio.start_server(self._handle, host, port, ssl=ssl_context)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StubServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                path, _, query = target.partition("?")
+                self.requests += 1
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+
+                handler = self.routes.get(path)
+                status, payload = handler(StubRequest(method, path, query, headers, body)) if handler else (404, b"")
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                writer.write(
+                    f"HTTP/1.1 {status} STUB\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
@@ -0,0 +1,57 @@
+"""Extract the login form's verification token with the targeted extractor and with a full BeautifulSoup parse.
+
+Run with ``python -m benchmarks.token_extraction``.
+"""
+
+import argparse
+import base64
+import os
+import time
+from collections.abc import Callable
+
+from src.medicover_client.forms import find_verification_token, parse_verification_token
+
+
+def generate_login_page(filler_kilobytes: int) -> tuple[bytes, str]:
+    token = "CfDJ8" + base64.urlsafe_b64encode(os.urandom(120)).decode().rstrip("=")
+    filler = "".join(
+        f'<div class="row" data-value="{index}"><label for="f{index}">Field {index}</label>'
+        f'<input id="f{index}" name="Field{index}" type="text" value="value {index}" /></div>\n'
+        for index in range(filler_kilobytes * 6)
+    )
+    page = (
+        "<!DOCTYPE html><html><head><title>Medicover</title>"
+        f"<script>var config = {{ 'locale': 'pl', 'items': [{', '.join(str(n) for n in range(500))}] }};</script>"
+        "</head><body><form method='post' action='/Account/Login'>"
+        f"{filler}"
+        '<input type="hidden" name="Input.ReturnUrl" value="/connect/authorize/callback" />'
+        f'<input name="__RequestVerificationToken" type="hidden" value="{token}" />'
+        "</form></body></html>"
+    )
+    return page.encode(), token
+
+
+def measure(name: str, extract: Callable[[bytes], str | None], page: bytes, token: str, repeats: int) -> None:
+    started = time.perf_counter()
+    for _ in range(repeats):
+        if extract(page) != token:
+            raise AssertionError(f"{name} returned a wrong token.")
+    elapsed = time.perf_counter() - started
+    print(f"{name:>14}: {elapsed / repeats * 1000:.3f}ms per page")
+
+
+def main(filler_kilobytes: int, repeats: int) -> None:
+    page, token = generate_login_page(filler_kilobytes)
+    print(f"login page of {len(page) / 1024:.0f}KB")
+
+    measure("targeted", find_verification_token, page, token, repeats)
+    measure("BeautifulSoup", parse_verification_token, page, token, repeats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kilobytes", type=int, default=40, help="Approximate size of the form filler")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    main(args.kilobytes, args.repeats)
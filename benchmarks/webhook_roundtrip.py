@@ -0,0 +1,113 @@
+"""Measure the command round trip of the bot's webhook mode against a local fake of the Telegram Bot API.
+
+Every round posts a ``/ping`` update to the webhook and waits until the reply reaches the fake API. Needs the
+``webhooks`` extra. Run with ``python -m benchmarks.webhook_roundtrip``.
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import time
+from urllib.parse import parse_qsl
+
+import httpx
+from telegram import Update
+from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
+
+from benchmarks.stub_server import StubHandler, StubRequest, StubServer, json_handler
+from src.monitoring.metrics import LatencyStats
+
+BOT_TOKEN = "123456:benchmark"
+SECRET_TOKEN = "benchmark-secret"
+USER = {"id": 1, "is_bot": False, "first_name": "Benchmark"}
+CHAT = {"id": 1, "type": "private"}
+
+
+def fake_telegram_routes(replies: asyncio.Queue[float]) -> dict[str, StubHandler]:
+    def send_message(request: StubRequest) -> tuple[int, bytes]:
+        replies.put_nowait(time.perf_counter())
+        text = dict(parse_qsl(request.body.decode())).get("text", "")
+        message = {"message_id": 2, "date": int(time.time()), "chat": CHAT, "text": text}
+        return 200, json.dumps({"ok": True, "result": message}).encode()
+
+    bot_user = {"id": 123456, "is_bot": True, "first_name": "Bot", "username": "benchmark_bot"}
+    return {
+        f"/bot{BOT_TOKEN}/getMe": json_handler({"ok": True, "result": bot_user}),
+        f"/bot{BOT_TOKEN}/setWebhook": json_handler({"ok": True, "result": True}),
+        f"/bot{BOT_TOKEN}/deleteWebhook": json_handler({"ok": True, "result": True}),
+        f"/bot{BOT_TOKEN}/sendMessage": send_message,
+    }
+
+
+def ping_update(update_id: int) -> dict[str, object]:
+    message = {
+        "message_id": update_id,
+        "date": int(time.time()),
+        "chat": CHAT,
+        "from": USER,
+        "text": "/ping",
+        "entities": [{"type": "bot_command", "offset": 0, "length": 5}],
+    }
+    return {"update_id": update_id, "message": message}
+
+
+async def pong(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if update.message is not None:
+        await update.message.reply_text("pong")
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return int(probe.getsockname()[1])
+
+
+async def run(webhook_url: str, replies: asyncio.Queue[float], rounds: int) -> None:
+    latency = LatencyStats()
+    async with httpx.AsyncClient() as client:
+        rejected = await client.post(webhook_url, json=ping_update(0), headers={"X-Telegram-Bot-Api-Secret-Token": "x"})
+        if rejected.status_code != httpx.codes.FORBIDDEN:
+            raise AssertionError(f"An update with a wrong secret token got {rejected.status_code}.")
+
+        for update_id in range(1, rounds + 1):
+            started = time.perf_counter()
+            response = await client.post(
+                webhook_url, json=ping_update(update_id), headers={"X-Telegram-Bot-Api-Secret-Token": SECRET_TOKEN}
+            )
+            response.raise_for_status()
+            replied = await asyncio.wait_for(replies.get(), timeout=5)
+            latency.record(replied - started)
+
+    print(f"webhook round trip: {latency.summary()}")
+
+
+async def main(rounds: int) -> None:
+    replies: asyncio.Queue[float] = asyncio.Queue()
+    async with StubServer(fake_telegram_routes(replies)) as telegram_api:
+        application = ApplicationBuilder().token(BOT_TOKEN).base_url(telegram_api.url + "/bot").build()
+        application.add_handler(CommandHandler("ping", pong))
+        port = free_port()
+        webhook_url = f"http://127.0.0.1:{port}/telegram"
+
+        async with application:
+            updater = application.updater
+            if updater is None:
+                raise RuntimeError("The application has no updater.")
+            await updater.start_webhook(
+                listen="127.0.0.1", port=port, url_path="telegram", webhook_url=webhook_url, secret_token=SECRET_TOKEN
+            )
+            await application.start()
+            try:
+                await run(webhook_url, replies, rounds)
+            finally:
+                await updater.stop()
+                await application.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.rounds))
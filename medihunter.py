@@ -5,7 +5,7 @@ this is a startpoint for adding new features
 import json
 import time
 from datetime import datetime, timedelta
-from typing import Callable, List
+from typing import Callable, List, Set
 
 import click
 import os
@@ -29,12 +29,12 @@ def make_duplicate_checker() -> Callable[[Appointment], bool]:
         True if appointment ocurred first time
         False otherwise
     """
-    found_appointments: List[Appointment] = []
+    found_appointments: Set[Appointment] = set()
 
     def duplicate_checker(appointment: Appointment) -> bool:
         if appointment in found_appointments:
             return False
-        found_appointments.append(appointment)
+        found_appointments.add(appointment)
         return True
 
     return duplicate_checker
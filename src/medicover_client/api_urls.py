@@ -14,3 +14,4 @@ FILTER_SEARCH_URL = BASE_URL + "/appointments/api/search-appointments/filters"
 APPOINTMENT_SEARCH_URL = BASE_URL + "/appointments/api/person-appointments/appointments"
 REGION_SEARCH_URL = BASE_URL + "/service-selector-configurator/api/search-appointments/filters/initial-filters"
 AVAILABLE_SLOT_SEARCH_URL = BASE_URL + "/appointments/api/search-appointments/slots"
+BOOK_APPOINTMENT_URL = BASE_URL + "/appointments/api/search-appointments/book-appointment"
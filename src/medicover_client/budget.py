@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+GLOBAL_REQUESTS_PER_SECOND = 5.0
+ACCOUNT_REQUESTS_PER_SECOND = 1.0
+BURST_SECONDS = 2.0
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available, refilling the bucket first."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class RequestBudget:
+    """Token buckets limiting upstream requests per Medicover account and in total.
+
+    A request takes a token from its account's bucket and from the global bucket at the same time, so waiting for
+    one never wastes a token of the other. Buckets hold ``burst_seconds`` worth of tokens.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = GLOBAL_REQUESTS_PER_SECOND,
+        account_rate: float = ACCOUNT_REQUESTS_PER_SECOND,
+        burst_seconds: float = BURST_SECONDS,
+    ) -> None:
+        self.account_rate = account_rate
+        self.burst_seconds = burst_seconds
+        self._global = TokenBucket(global_rate, max(1.0, global_rate * burst_seconds))
+        self._accounts: dict[str, TokenBucket] = {}
+
+    def configure(self, global_rate: float, account_rate: float) -> None:
+        if global_rate <= 0 or account_rate <= 0:
+            raise ValueError("Request rates must be positive.")
+        self.account_rate = account_rate
+        self._global = TokenBucket(global_rate, max(1.0, global_rate * self.burst_seconds))
+        self._accounts.clear()
+
+    async def acquire(self, account: str) -> None:
+        bucket = self._accounts.get(account)
+        if bucket is None:
+            bucket = self._accounts[account] = TokenBucket(
+                self.account_rate, max(1.0, self.account_rate * self.burst_seconds)
+            )
+
+        while True:
+            wait_time = max(bucket.wait_time(), self._global.wait_time())
+            if not wait_time:
+                bucket.take()
+                self._global.take()
+                return
+            await asyncio.sleep(wait_time)
+
+
+request_budget = RequestBudget()
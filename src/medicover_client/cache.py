@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, NamedTuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheEntry(NamedTuple, Generic[V]):
+    value: V
+    stored_at: float
+
+
+class AsyncTTLCache(Generic[K, V]):
+    """Size-bounded LRU cache with a TTL that serves stale entries while they are refreshed in the background.
+
+    Concurrent misses for the same key share one fetch.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_size: int) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[K, CacheEntry[V]] = OrderedDict()
+        self._in_flight: dict[K, asyncio.Task[V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_or_fetch(self, key: K, fetch: Callable[[], Awaitable[V]]) -> V:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = time.monotonic() - entry.stored_at
+            if age < self.ttl:
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                if key not in self._in_flight:
+                    self._schedule_fetch(key, fetch).add_done_callback(self._log_revalidation_error)
+                return entry.value
+
+        return await asyncio.shield(self._schedule_fetch(key, fetch))
+
+    def invalidate(self, key: K | None = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def _schedule_fetch(self, key: K, fetch: Callable[[], Awaitable[V]]) -> asyncio.Task[V]:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._fetch(key, fetch))
+            self._in_flight[key] = task
+        return task
+
+    async def _fetch(self, key: K, fetch: Callable[[], Awaitable[V]]) -> V:
+        try:
+            value = await fetch()
+        finally:
+            self._in_flight.pop(key, None)
+
+        self._entries[key] = CacheEntry(value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    @staticmethod
+    def _log_revalidation_error(task: asyncio.Task[V]) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Refreshing a stale cache entry failed.", exc_info=task.exception())
@@ -1,27 +1,47 @@
 import asyncio
 import base64
 import hashlib
+import json
 import logging
+import time
 import uuid
+from collections import defaultdict
+from collections.abc import Sequence
 from datetime import date, datetime
 from functools import wraps
-from typing import Any, Awaitable, Callable, TypedDict, TypeVar, cast
+from itertools import count
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine, TypedDict, TypeVar, cast
 
 import httpx
-from bs4 import BeautifulSoup, Tag
 from httpx import AsyncClient, Headers, QueryParams
 
 from src.medicover_client.api_urls import (
     APPOINTMENT_SEARCH_URL,
     AUTHORIZATION_URL,
     AVAILABLE_SLOT_SEARCH_URL,
+    BOOK_APPOINTMENT_URL,
     FILTER_SEARCH_URL,
     OIDC_URL,
     REGION_SEARCH_URL,
     TOKEN_URL,
 )
-from src.medicover_client.exceptions import AuthenticationError, IncorrectLoginError
-from src.medicover_client.types import AppointmentItem, SlotItem
+from src.medicover_client.budget import RequestBudget
+from src.medicover_client.cache import AsyncTTLCache
+from src.medicover_client.decoding import decode_appointments, decode_slots
+from src.medicover_client.exceptions import AuthenticationError, IncorrectLoginError, UnsupportedSessionError
+from src.medicover_client.forms import extract_verification_token
+from src.medicover_client.logins import login_orchestrator
+from src.medicover_client.session import SESSION_VERSION, MedicoverSession
+from src.medicover_client.slots import Slot, SlotQuery, SlotWindow, demultiplex_slots
+from src.medicover_client.types import AppointmentItem, BookedAppointment
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    # h2 comes with the "http2" extra of httpx, clients fall back to HTTP/1.1 keep-alive without it.
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +53,31 @@ class FilterDataType(TypedDict):
 
 R = TypeVar("R")
 MAX_RETRY_ATTEMPTS = 3
+MAX_PAGE_SIZE = 5000
+MAX_BATCH_SIZE = 20
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=120)
+DEFAULT_TIMEOUT = httpx.Timeout(15)
+FILTERS_CACHE_TTL = 15 * 60
+FILTERS_CACHE_STALE_TTL = 60 * 60
+FILTERS_CACHE_MAX_SIZE = 2048
+TOKEN_REFRESH_MARGIN = 120
+REFRESH_RETRY_DELAY = 30
+
+# Filter catalogs are the same for every account, so one cache is shared by all clients in the process.
+filters_cache: AsyncTTLCache[tuple[str, str | None, str | None, str | None], dict[str, list[FilterDataType]]] = (
+    AsyncTTLCache(ttl=FILTERS_CACHE_TTL, stale_ttl=FILTERS_CACHE_STALE_TTL, max_size=FILTERS_CACHE_MAX_SIZE)
+)
+
+
+def decode_token_expiry(token: str) -> float | None:
+    """Read the ``exp`` claim of a JWT without verifying its signature."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
 
 
 def with_login_retry(func: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
@@ -41,18 +86,22 @@ def with_login_retry(func: Callable[..., Awaitable[R]]) -> Callable[..., Awaitab
         attempts = 0
 
         while attempts < MAX_RETRY_ATTEMPTS:
-            if self._token is None:
+            if not self._token:
                 logger.warning("Attempt %s to sign in.", attempts + 1)
-                await self.log_in()
+                await self.resume_session()
 
+            token_used = self._token
             try:
-                await self.do_refresh_token()
+                await self.ensure_valid_token()
+                # Remember which token the request went out with, after any inline refresh, so a 401 only
+                # triggers a new sign-in if nobody else has re-authenticated since.
+                token_used = self._token
                 return await func(self, *args, **kwargs)
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == httpx.codes.UNAUTHORIZED:
                     self.sign_in_cookie = None
                     logger.warning("Received 401 Unauthorized. Attempt %s to re-authenticate.", attempts + 1)
-                    await self.log_in()
+                    await self.reauthenticate(stale_token=token_used)
                 else:
                     raise
             finally:
@@ -64,13 +113,108 @@ def with_login_retry(func: Callable[..., Awaitable[R]]) -> Callable[..., Awaitab
 
 
 class MedicoverClient:
-    def __init__(self, username: str, password: str) -> None:
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        pool_limits: httpx.Limits = DEFAULT_POOL_LIMITS,
+        http2: bool = True,
+        budget: RequestBudget | None = None,
+    ) -> None:
         self.username = username
         self.password = password
         self.sign_in_cookie: None | str = None
         self._token: str = ""
+        self.token_expires_at: float | None = None
         self.refresh_token: None | str = None
         self.filters: None | dict[str, list[FilterDataType]] = None
+        self.pool_limits = pool_limits
+        self.http2 = http2
+        # Every upstream request of the account, sign-ins included, waits for a token of the budget when one is set.
+        self.budget = budget
+        self._http_client: AsyncClient | None = None
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._auth_task: asyncio.Task[None] | None = None
+        self.session_id = uuid.uuid4().hex
+        self.login_priority = 1.0
+        self.token_listeners: list[Callable[[MedicoverClient], None]] = []
+
+    @classmethod
+    def from_session(cls, session: MedicoverSession, budget: RequestBudget | None = None) -> "MedicoverClient":
+        if session.get("version") != SESSION_VERSION:
+            raise UnsupportedSessionError(f"Unsupported session version {session.get('version')}.")
+        client = cls(session["username"], session["password"], budget=budget)
+        client.session_id = session["session_id"]
+        client._token = session["token"]
+        client.token_expires_at = session["token_expires_at"]
+        client.refresh_token = session["refresh_token"]
+        client.sign_in_cookie = session["sign_in_cookie"]
+        return client
+
+    def to_session(self) -> MedicoverSession:
+        return MedicoverSession(
+            version=SESSION_VERSION,
+            session_id=self.session_id,
+            username=self.username,
+            password=self.password,
+            token=self._token,
+            token_expires_at=self.token_expires_at,
+            refresh_token=self.refresh_token,
+            sign_in_cookie=self.sign_in_cookie,
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The connection pool is bound to the running event loop, so it is never persisted.
+        state = self.__dict__.copy()
+        state["_http_client"] = None
+        state["budget"] = None
+        state["_refresh_task"] = None
+        state["_auth_task"] = None
+        state["token_listeners"] = []
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        state.setdefault("pool_limits", DEFAULT_POOL_LIMITS)
+        state.setdefault("http2", True)
+        state.setdefault("_http_client", None)
+        state.setdefault("budget", None)
+        state.setdefault("_refresh_task", None)
+        state.setdefault("_auth_task", None)
+        state.setdefault("session_id", uuid.uuid4().hex)
+        state.setdefault("login_priority", 1.0)
+        state["token_listeners"] = []
+        state.setdefault("token_expires_at", decode_token_expiry(state.get("_token", "")))
+        self.__dict__.update(state)
+
+    async def __aenter__(self) -> "MedicoverClient":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.aclose()
+
+    @property
+    def http_client(self) -> AsyncClient:
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = AsyncClient(
+                http2=self.http2 and HTTP2_AVAILABLE,
+                limits=self.pool_limits,
+                timeout=DEFAULT_TIMEOUT,
+                event_hooks={"request": [self._acquire_budget]},
+            )
+        return self._http_client
+
+    async def _acquire_budget(self, request: httpx.Request) -> None:
+        # Runs for every request the HTTP clients send, including each hop of a followed redirect.
+        if self.budget is not None:
+            await self.budget.acquire(self.username)
+
+    async def aclose(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
     @property
     def token(self) -> str:
@@ -80,7 +224,101 @@ class MedicoverClient:
     def headers(self) -> Headers:
         return Headers({"authorization": self.token, "Host": "api-gateway-online24.medicover.pl"})
 
-    async def do_refresh_token(self) -> None:
+    @property
+    def has_valid_token(self) -> bool:
+        return bool(self._token) and not self.token_expires_soon
+
+    @property
+    def token_expires_soon(self) -> bool:
+        if self.token_expires_at is None:
+            return False
+        return self.token_expires_at - time.time() <= TOKEN_REFRESH_MARGIN
+
+    def _set_token(self, token: str, refresh_token: str) -> None:
+        self._token = token
+        self.refresh_token = refresh_token
+        self.token_expires_at = decode_token_expiry(token)
+        if self.token_expires_soon:
+            logger.warning(
+                "Received a token that expires within the refresh margin of %s seconds, check the clock.",
+                TOKEN_REFRESH_MARGIN,
+            )
+        for listener in self.token_listeners:
+            listener(self)
+
+    def _clear_session(self) -> None:
+        self._token = ""
+        self.refresh_token = None
+        self.token_expires_at = None
+        self.sign_in_cookie = None
+        for listener in self.token_listeners:
+            listener(self)
+
+    async def ensure_valid_token(self) -> None:
+        """Refresh the session only when the token is close to expiring and keep the background refresher alive."""
+        if self.token_expires_soon:
+            await self.refresh_session()
+        self._start_token_refresher()
+
+    async def refresh_session(self) -> None:
+        await self._single_flight(self._refresh_or_log_in)
+
+    async def resume_session(self) -> None:
+        """Obtain a token for a client that has none, exchanging a persisted refresh token before signing in."""
+        if self._token:
+            return
+        await self._single_flight(self._refresh_or_log_in)
+
+    async def reauthenticate(self, stale_token: str) -> None:
+        """Sign in again unless another caller already replaced ``stale_token`` in the meantime."""
+        if self._token != stale_token:
+            return
+        await self._single_flight(self._queued_log_in)
+
+    async def _single_flight(self, operation: Callable[[], Coroutine[Any, Any, None]]) -> None:
+        # Concurrent callers join the authentication already in progress instead of starting their own,
+        # and the shield keeps a cancelled caller from aborting it for everybody else.
+        if self._auth_task is None or self._auth_task.done():
+            self._auth_task = asyncio.get_running_loop().create_task(operation())
+        await asyncio.shield(self._auth_task)
+
+    async def _refresh_or_log_in(self) -> None:
+        if await self.do_refresh_token():
+            return
+        logger.warning("Refreshing the token failed, signing in again.")
+        await self._queued_log_in()
+
+    async def _queued_log_in(self) -> None:
+        # Background sign-ins of many clients wait their turn instead of hitting the identity server together.
+        await login_orchestrator.run(self.log_in, self.login_priority)
+
+    def _start_token_refresher(self) -> None:
+        if self.token_expires_at is None:
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_token_periodically())
+
+    async def _refresh_token_periodically(self) -> None:
+        while self.token_expires_at is not None:
+            # Short-lived tokens or a skewed clock would otherwise put the refresh inside the margin right away
+            # and have the loop refresh back to back.
+            await asyncio.sleep(max(self.token_expires_at - TOKEN_REFRESH_MARGIN - time.time(), REFRESH_RETRY_DELAY))
+            try:
+                await self.refresh_session()
+            except httpx.HTTPError:
+                logger.exception("Background token refresh failed. Retrying in %s seconds.", REFRESH_RETRY_DELAY)
+                await asyncio.sleep(REFRESH_RETRY_DELAY)
+            except IncorrectLoginError:
+                # Retrying with rejected credentials would only risk locking the account. The next request signs in
+                # again and reports the error to the user.
+                logger.warning("Background sign-in was rejected, dropping the session.")
+                self._clear_session()
+                return
+            except Exception:
+                logger.exception("Background token refresh failed, stopping the refresher.")
+                return
+
+    async def do_refresh_token(self) -> bool:
         refresh_token_data = {
             "grant_type": "refresh_token",
             "refresh_token": self.refresh_token,
@@ -90,16 +328,26 @@ class MedicoverClient:
 
         headers = self.headers
         headers.pop("Host")
+        if not self._token:
+            headers.pop("authorization")
 
-        async with AsyncClient() as client:
-            response = await client.post(TOKEN_URL, headers=headers, data=refresh_token_data)
-            if response.status_code != httpx.codes.OK:
-                return
-            self._token = response.json()["access_token"]
-            self.refresh_token = response.json()["refresh_token"]
+        if self.refresh_token is None:
+            return False
+
+        response = await self.http_client.post(TOKEN_URL, headers=headers, data=refresh_token_data)
+        if response.status_code != httpx.codes.OK:
+            return False
+        response_json = response.json()
+        self._set_token(response_json["access_token"], response_json["refresh_token"])
+        return True
 
     async def log_in(self) -> None:
-        async with AsyncClient() as client:
+        # The sign-in runs on its own cookie jar, so it never disturbs API calls in flight on the pooled client.
+        async with AsyncClient(
+            http2=self.http2 and HTTP2_AVAILABLE,
+            timeout=DEFAULT_TIMEOUT,
+            event_hooks={"request": [self._acquire_budget]},
+        ) as client:
             code_verifier = "".join(uuid.uuid4().hex for _ in range(3))
             code_challenge = (
                 base64.urlsafe_b64encode(hashlib.sha256(code_verifier.encode()).digest()).decode().rstrip("=")
@@ -118,8 +366,7 @@ class MedicoverClient:
 
             response = await client.get(AUTHORIZATION_URL, params=url_params, follow_redirects=True)
 
-            page = BeautifulSoup(response.content, "html.parser")
-            token = cast(Tag, page.find("input", {"name": "__RequestVerificationToken"})).get("value")
+            token = await extract_verification_token(response.content)
 
             login_form = {
                 "Input.ReturnUrl": "/connect/authorize/callback?" + str(url_params),
@@ -147,15 +394,13 @@ class MedicoverClient:
             response = await client.post(TOKEN_URL, data=token_data)
             response_json = response.json()
 
-            self._token = response_json["id_token"]
-            self.refresh_token = response_json["refresh_token"]
+            self._set_token(response_json["id_token"], response_json["refresh_token"])
 
             logger.info("Successfully logged in")
 
     async def load_filters(self) -> None:
-        async with AsyncClient(headers=self.headers) as client:
-            response = await client.get(FILTER_SEARCH_URL)
-            response.raise_for_status()
+        response = await self.http_client.get(FILTER_SEARCH_URL, headers=self.headers)
+        response.raise_for_status()
 
         self.filters = response.json()
 
@@ -167,46 +412,163 @@ class MedicoverClient:
             logger.info("No slots available for given parameters. Trying again in 30 seconds...")
             await asyncio.sleep(30)
 
-    @with_login_retry
     async def get_available_slots(
         self,
-        region_id: int,
-        specialization_id: int,
+        region_id: str,
+        specialization_id: str,
         from_date: datetime | date,
-        doctor_id: int | None = None,
-        clinic_id: int | None = None,
-    ) -> list[SlotItem]:
-        search_since_formatted = from_date.strftime("%Y-%m-%d")
-        async with AsyncClient(headers=self.headers) as client:
-            response = await client.get(
-                AVAILABLE_SLOT_SEARCH_URL,
-                params={
-                    "Page": 1,
-                    "PageSize": 5000,
-                    "RegionIds": [region_id],
-                    "SpecialtyIds": [specialization_id],
-                    "ClinicIds": [clinic_id] if clinic_id else [],
-                    "DoctorIds": [doctor_id] if doctor_id else [],
-                    "StartTime": search_since_formatted,
-                },
-                timeout=15,
-            )
-            response.raise_for_status()
+        doctor_id: str | None = None,
+        clinic_id: str | None = None,
+        window: SlotWindow | None = None,
+    ) -> list[Slot]:
+        params = self._slot_search_params(region_id, specialization_id, from_date, doctor_id, clinic_id, window)
+        slots: list[Slot] = []
+        # Broad searches can exceed the page size, so full pages are followed until a partial one arrives.
+        for page in count(1):
+            page_slots = await self._fetch_slots_page(params, page=page, page_size=MAX_PAGE_SIZE)
+            slots.extend(page_slots)
+            if len(page_slots) < MAX_PAGE_SIZE:
+                break
+        if window is None:
+            return slots
+        # Time-of-day bounds cannot be sent upstream, so they are applied right after the page is decoded.
+        return window.filter(slots)
 
-        response_json = response.json()
-        return cast(list[SlotItem], response_json["items"])
+    async def iter_available_slots(
+        self,
+        region_id: str,
+        specialization_id: str,
+        from_date: datetime | date,
+        doctor_id: str | None = None,
+        clinic_id: str | None = None,
+        window: SlotWindow | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[Slot]:
+        """Yield matching slots page by page, so a caller that stops early never downloads the remaining pages."""
+        params = self._slot_search_params(region_id, specialization_id, from_date, doctor_id, clinic_id, window)
+
+        for page in count(1):
+            slots = await self._fetch_slots_page(params, page=page, page_size=page_size)
+            for slot in slots if window is None else window.filter(slots):
+                yield slot
+            if len(slots) < page_size:
+                return
+
+    async def get_available_slots_batch(self, queries: Sequence[SlotQuery]) -> dict[SlotQuery, list[Slot]]:
+        """Answer several slot queries with as few upstream requests as possible.
+
+        The endpoint accepts lists of regions, specialties, clinics and doctors, so compatible queries are packed
+        into one request and the returned slots are split back out per query. A group returned by
+        ``pack_slot_queries`` is answered with a single, possibly paged, search.
+        """
+        results: dict[SlotQuery, list[Slot]] = {}
+
+        for group in self.pack_slot_queries(queries):
+            params = self._batch_search_params(group)
+            slots: list[Slot] = []
+            for page in count(1):
+                page_slots = await self._fetch_slots_page(params, page=page, page_size=MAX_PAGE_SIZE)
+                slots.extend(page_slots)
+                if len(page_slots) < MAX_PAGE_SIZE:
+                    break
+            results.update(demultiplex_slots(slots, group))
+
+        return results
+
+    @staticmethod
+    def pack_slot_queries(queries: Sequence[SlotQuery]) -> list[list[SlotQuery]]:
+        """Groups queries that can share one search request."""
+        # Slots do not say which region they belong to, so queries that are not pinned to a clinic can only share
+        # a request with queries from the same region. Clinic-specific queries can be packed across regions.
+        by_region: defaultdict[str, list[SlotQuery]] = defaultdict(list)
+        clinic_specific: list[SlotQuery] = []
+        for query in dict.fromkeys(queries):
+            (clinic_specific if query.clinic_id else by_region[query.region_id]).append(query)
+
+        groups = [*by_region.values(), clinic_specific] if clinic_specific else list(by_region.values())
+        return [
+            group[start : start + MAX_BATCH_SIZE] for group in groups for start in range(0, len(group), MAX_BATCH_SIZE)
+        ]
+
+    @staticmethod
+    def _batch_search_params(queries: Sequence[SlotQuery]) -> dict[str, Any]:
+        to_dates = [query.to_date for query in queries]
+
+        params: dict[str, Any] = {
+            "RegionIds": list(dict.fromkeys(query.region_id for query in queries)),
+            "SpecialtyIds": list(dict.fromkeys(query.specialization_id for query in queries)),
+            # A single query without a clinic or doctor filter means the whole request cannot filter on it.
+            "ClinicIds": (
+                list(dict.fromkeys(query.clinic_id for query in queries if query.clinic_id))
+                if all(query.clinic_id for query in queries)
+                else []
+            ),
+            "DoctorIds": (
+                list(dict.fromkeys(query.doctor_id for query in queries if query.doctor_id))
+                if all(query.doctor_id for query in queries)
+                else []
+            ),
+            "StartTime": min(query.from_date for query in queries).strftime("%Y-%m-%d"),
+        }
+        if all(to_date is not None for to_date in to_dates):
+            params["EndTime"] = max(cast(list[date], to_dates)).strftime("%Y-%m-%d")
+        return params
+
+    @staticmethod
+    def _slot_search_params(
+        region_id: str,
+        specialization_id: str,
+        from_date: datetime | date,
+        doctor_id: str | None,
+        clinic_id: str | None,
+        window: SlotWindow | None,
+    ) -> dict[str, Any]:
+        params: dict[str, Any] = {
+            "RegionIds": [region_id],
+            "SpecialtyIds": [specialization_id],
+            "ClinicIds": [clinic_id] if clinic_id else [],
+            "DoctorIds": [doctor_id] if doctor_id else [],
+            "StartTime": from_date.strftime("%Y-%m-%d"),
+        }
+        if window is not None and window.to_date is not None:
+            params["EndTime"] = window.to_date.strftime("%Y-%m-%d")
+        return params
 
     @with_login_retry
-    async def get_all_regions(self) -> list[FilterDataType]:
-        async with AsyncClient(headers=self.headers) as client:
-            response = await client.get(REGION_SEARCH_URL)
-            response.raise_for_status()
+    async def _fetch_slots_page(self, params: dict[str, Any], page: int, page_size: int) -> list[Slot]:
+        response = await self.http_client.get(
+            AVAILABLE_SLOT_SEARCH_URL,
+            headers=self.headers,
+            params={**params, "Page": page, "PageSize": page_size},
+        )
+        response.raise_for_status()
 
-        response_json = response.json()
+        return list(decode_slots(response.content))
+
+    @with_login_retry
+    async def book_slot(self, booking_string: str) -> BookedAppointment:
+        response = await self.http_client.post(
+            BOOK_APPOINTMENT_URL,
+            headers=self.headers,
+            json={"bookingString": booking_string, "metadata": {"appointmentSource": "Direct"}},
+        )
+        response.raise_for_status()
+
+        return cast(BookedAppointment, response.json())
+
+    async def get_all_regions(self) -> list[FilterDataType]:
+        response_json = await filters_cache.get_or_fetch((REGION_SEARCH_URL, None, None, None), self._fetch_regions)
         response_regions: list[FilterDataType] = response_json.get("regions", [])
 
         return response_regions
 
+    @with_login_retry
+    async def _fetch_regions(self) -> dict[str, list[FilterDataType]]:
+        response = await self.http_client.get(REGION_SEARCH_URL, headers=self.headers)
+        response.raise_for_status()
+
+        return cast(dict[str, list[FilterDataType]], response.json())
+
     async def get_all_specializations(self, region_id: str) -> list[FilterDataType]:
         response_json = await self.get_filters_data(region_id, None, None)
 
@@ -230,40 +592,57 @@ class MedicoverClient:
 
         return response_specializations
 
-    @with_login_retry
     async def get_filters_data(
         self, region_id: str, specialization_id: str | None = None, clinic_id: str | None = None
     ) -> dict[str, list[FilterDataType]]:
-        async with AsyncClient(headers=self.headers) as client:
-            response = await client.get(
-                FILTER_SEARCH_URL,
-                params={
-                    "RegionIds": region_id,
-                    "SpecialtyIds": specialization_id,
-                    "ClinicIds": clinic_id,
-                },
-            )
-            response.raise_for_status()
+        return await filters_cache.get_or_fetch(
+            (FILTER_SEARCH_URL, region_id, specialization_id, clinic_id),
+            lambda: self._fetch_filters_data(region_id, specialization_id, clinic_id),
+        )
+
+    @with_login_retry
+    async def _fetch_filters_data(
+        self, region_id: str, specialization_id: str | None = None, clinic_id: str | None = None
+    ) -> dict[str, list[FilterDataType]]:
+        response = await self.http_client.get(
+            FILTER_SEARCH_URL,
+            headers=self.headers,
+            params={
+                "RegionIds": region_id,
+                "SpecialtyIds": specialization_id,
+                "ClinicIds": clinic_id,
+            },
+        )
+        response.raise_for_status()
 
         response_json = response.json()
         return cast(dict[str, list[FilterDataType]], response_json)
 
-    @with_login_retry
     async def get_future_appointments(self) -> list[AppointmentItem]:
-        today = date.today().strftime("%Y-%m-%d")
-
-        async with AsyncClient(headers=self.headers) as client:
-            response = await client.get(
-                APPOINTMENT_SEARCH_URL,
-                params={
-                    "Page": 1,
-                    "PageSize": 5000,
-                    "AppointmentState": "All",
-                    "dateFrom": today,
-                },
-            )
-            response.raise_for_status()
+        return await self._fetch_appointments_page(date.today(), page=1, page_size=MAX_PAGE_SIZE)
 
-        items = cast(list[AppointmentItem], response.json().get("items", []))
+    async def iter_future_appointments(self, page_size: int = DEFAULT_PAGE_SIZE) -> AsyncIterator[AppointmentItem]:
+        today = date.today()
 
-        return items
+        for page in count(1):
+            appointments = await self._fetch_appointments_page(today, page=page, page_size=page_size)
+            for appointment in appointments:
+                yield appointment
+            if len(appointments) < page_size:
+                return
+
+    @with_login_retry
+    async def _fetch_appointments_page(self, date_from: date, page: int, page_size: int) -> list[AppointmentItem]:
+        response = await self.http_client.get(
+            APPOINTMENT_SEARCH_URL,
+            headers=self.headers,
+            params={
+                "Page": page,
+                "PageSize": page_size,
+                "AppointmentState": "All",
+                "dateFrom": date_from.strftime("%Y-%m-%d"),
+            },
+        )
+        response.raise_for_status()
+
+        return decode_appointments(response.content)
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any
+
+import httpx
+
+from src.medicover_client.client import MedicoverClient
+from src.medicover_client.exceptions import AuthenticationError, IncorrectLoginError
+from src.medicover_client.matching import match_windows
+from src.medicover_client.slots import Slot, SlotQuery, SlotWindow
+
+logger = logging.getLogger(__name__)
+
+SlotResultListener = Callable[[SlotQuery, list[Slot]], None]
+UpstreamOutcomeListener = Callable[[float, int | None], None]
+SlotMatches = tuple[list[Slot], dict[SlotWindow, list[Slot]]]
+PackedResults = tuple[float, dict[SlotQuery, list[Slot]]]
+
+MAX_RESPONSE_AGE = 300.0
+
+
+class SlotQueryCoalescer:
+    """Merges concurrent identical slot searches into one upstream request.
+
+    Every caller subscribes with its own client. The request is sent with whichever subscribed client currently
+    holds a valid session, and the parsed result is handed to all subscribers. The time windows of all subscribers
+    are matched against the response in one batch.
+    A caller passing ``max_age`` is instead answered from the latest response to its query while that response is
+    younger than ``max_age`` seconds, so monitors sharing a query whose polls drift apart still cost one upstream
+    request per interval. Responses are kept for at most ``max_response_age`` seconds.
+    Result listeners see every upstream response exactly once, however many subscribers shared it. Outcome
+    listeners get the latency and status code of every upstream search, or None as the status on transport errors.
+    ``search_together`` starts the searches of queries that fall due together ahead of their polls, sharing one
+    list-valued request among the queries it can pack.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[SlotQuery, asyncio.Task[SlotMatches]] = {}
+        self._subscribers: dict[SlotQuery, list[MedicoverClient]] = {}
+        self._windows: dict[SlotQuery, list[SlotWindow]] = {}
+        self._responses: OrderedDict[SlotQuery, tuple[float, list[Slot]]] = OrderedDict()
+        self.max_response_age = MAX_RESPONSE_AGE
+        self.result_listeners: list[SlotResultListener] = []
+        self.outcome_listeners: list[UpstreamOutcomeListener] = []
+
+    def has_fresh_response(self, query: SlotQuery, max_age: float) -> bool:
+        response = self._responses.get(query)
+        return response is not None and time.monotonic() - response[0] < max_age
+
+    async def get_available_slots(
+        self, client: MedicoverClient, query: SlotQuery, window: SlotWindow | None = None, max_age: float = 0.0
+    ) -> list[Slot]:
+        if self.has_fresh_response(query, max_age):
+            slots = self._responses[query][1]
+            return slots if window is None else window.filter(slots)
+
+        subscribers = self._subscribers.setdefault(query, [])
+        subscribers.append(client)
+        if window is not None:
+            self._windows.setdefault(query, []).append(window)
+
+        task = self._in_flight.get(query)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._fetch(query))
+            self._in_flight[query] = task
+
+        try:
+            slots, matches = await asyncio.shield(task)
+        finally:
+            subscribers.remove(client)
+            if not subscribers and self._subscribers.get(query) is subscribers:
+                del self._subscribers[query]
+
+        if window is None:
+            return slots
+        if window in matches:
+            return matches[window]
+        return window.filter(slots)
+
+    def search_together(self, client: MedicoverClient, queries: Sequence[SlotQuery]) -> None:
+        """Starts the searches for several queries of one account, packed into as few upstream requests as possible.
+
+        Each query becomes an in-flight search that later callers of ``get_available_slots`` join as usual. Queries
+        already in flight are left alone. When a packed request fails, its queries are searched for one by one.
+        """
+        loop = asyncio.get_running_loop()
+        pending = [query for query in dict.fromkeys(queries) if query not in self._in_flight]
+
+        for group in client.pack_slot_queries(pending):
+            batch: asyncio.Task[PackedResults] | None = None
+            if len(group) > 1:
+                batch = loop.create_task(self._search_packed(client, group))
+                batch.add_done_callback(_retrieve_exception)
+            for query in group:
+                task = loop.create_task(self._fetch(query, client, batch))
+                # Nobody may be waiting for a search started ahead of the polls, so its failure is only logged.
+                task.add_done_callback(_retrieve_exception)
+                self._in_flight[query] = task
+
+    async def _fetch(
+        self,
+        query: SlotQuery,
+        preferred: MedicoverClient | None = None,
+        batch: asyncio.Task[PackedResults] | None = None,
+    ) -> SlotMatches:
+        try:
+            if batch is not None:
+                try:
+                    started, results = await asyncio.shield(batch)
+                except Exception as error:
+                    logger.warning("Packed slot search failed (%r), searching for %s on its own.", error, query)
+                else:
+                    return self._publish(query, started, results[query])
+
+            started, slots = await self._search(query, preferred)
+            return self._publish(query, started, slots)
+        finally:
+            del self._in_flight[query]
+            self._windows.pop(query, None)
+
+    async def _search(self, query: SlotQuery, preferred: MedicoverClient | None = None) -> tuple[float, list[Slot]]:
+        tried: set[int] = set()
+        while True:
+            client = self._pick_client(query, tried, preferred)
+            if client is None:
+                raise AuthenticationError("None of the subscribed sessions could search for slots.")
+            tried.add(id(client))
+
+            started = time.monotonic()
+            try:
+                slots = await client.get_available_slots(
+                    query.region_id,
+                    query.specialization_id,
+                    query.from_date,
+                    query.doctor_id,
+                    query.clinic_id,
+                    SlotWindow(to_date=query.to_date) if query.to_date else None,
+                )
+            except (AuthenticationError, IncorrectLoginError):
+                logger.warning("Slot search failed for %s, trying another subscribed session.", client.username)
+                continue
+            except httpx.HTTPStatusError as error:
+                self._report_outcome(started, error.response.status_code)
+                raise
+            except httpx.TransportError:
+                self._report_outcome(started, None)
+                raise
+
+            self._report_outcome(started, httpx.codes.OK)
+            return started, slots
+
+    async def _search_packed(self, client: MedicoverClient, queries: list[SlotQuery]) -> PackedResults:
+        started = time.monotonic()
+        try:
+            results = await client.get_available_slots_batch(queries)
+        except httpx.HTTPStatusError as error:
+            self._report_outcome(started, error.response.status_code)
+            raise
+        except httpx.TransportError:
+            self._report_outcome(started, None)
+            raise
+
+        self._report_outcome(started, httpx.codes.OK)
+        return started, results
+
+    def _publish(self, query: SlotQuery, fetched_at: float, slots: list[Slot]) -> SlotMatches:
+        self._store_response(query, fetched_at, slots)
+
+        for listener in self.result_listeners:
+            listener(query, slots)
+
+        windows = list(dict.fromkeys(self._windows.get(query, ())))
+        return slots, dict(zip(windows, match_windows(slots, windows), strict=True))
+
+    def _store_response(self, query: SlotQuery, fetched_at: float, slots: list[Slot]) -> None:
+        self._responses[query] = (fetched_at, slots)
+        self._responses.move_to_end(query)
+        # Entries are ordered by fetch time, so expired responses of queries nobody polls anymore leave from the front.
+        while self._responses:
+            oldest_fetched_at, _ = next(iter(self._responses.values()))
+            if fetched_at - oldest_fetched_at <= self.max_response_age:
+                break
+            self._responses.popitem(last=False)
+
+    def _report_outcome(self, started: float, status_code: int | None) -> None:
+        latency = time.monotonic() - started
+        for listener in self.outcome_listeners:
+            listener(latency, status_code)
+
+    def _pick_client(
+        self, query: SlotQuery, tried: set[int], preferred: MedicoverClient | None = None
+    ) -> MedicoverClient | None:
+        clients = [*self._subscribers.get(query, []), *([preferred] if preferred is not None else [])]
+        candidates = [client for client in clients if id(client) not in tried]
+        return next((client for client in candidates if client.has_valid_token), next(iter(candidates), None))
+
+
+def _retrieve_exception(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Background slot search failed.", exc_info=task.exception())
+
+
+slot_query_coalescer = SlotQueryCoalescer()
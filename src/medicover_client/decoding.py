@@ -0,0 +1,31 @@
+import json
+from collections.abc import Iterator
+from typing import cast
+
+from src.medicover_client.slots import Slot
+from src.medicover_client.types import AppointmentItem, SlotItem
+
+try:
+    from src.medicover_client import structs
+except ImportError:
+    # msgspec is an optional dependency (the "fast-json" extra), the stdlib decoder is used without it.
+    structs = None  # type: ignore[assignment]
+
+
+def decode_slots(content: bytes) -> Iterator[Slot]:
+    if structs is not None:
+        try:
+            return structs.decode_slots(content)
+        except ValueError:
+            # The typed decoder rejects payloads that do not match the schema, the generic one below is lenient.
+            pass
+    return map(Slot.from_item, cast(list[SlotItem], json.loads(content)["items"]))
+
+
+def decode_appointments(content: bytes) -> list[AppointmentItem]:
+    if structs is not None:
+        try:
+            return structs.decode_appointments(content)
+        except ValueError:
+            pass
+    return cast(list[AppointmentItem], json.loads(content).get("items", []))
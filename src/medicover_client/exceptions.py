@@ -4,3 +4,7 @@ class IncorrectLoginError(Exception):
 
 class AuthenticationError(Exception):
     pass
+
+
+class UnsupportedSessionError(Exception):
+    pass
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import re
+
+from bs4 import BeautifulSoup, Tag
+
+from src.medicover_client.exceptions import AuthenticationError
+
+logger = logging.getLogger(__name__)
+
+VERIFICATION_TOKEN_FIELD = "__RequestVerificationToken"
+
+TOKEN_INPUT_PATTERN = re.compile(
+    rb"<input\b[^>]*\bname\s*=\s*[\"']__RequestVerificationToken[\"'][^>]*>", re.IGNORECASE
+)
+VALUE_PATTERN = re.compile(rb"(?<![\w-])value\s*=\s*(?:\"([^\"]*)\"|'([^']*)')", re.IGNORECASE)
+# Anti-forgery tokens are base64url; anything else, such as an HTML entity, is left to the full parser.
+VALID_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_\-+/=]{16,}")
+
+
+def find_verification_token(content: bytes) -> str | None:
+    """Reads the token straight from its ``<input>`` tag without parsing the rest of the page."""
+    tag = TOKEN_INPUT_PATTERN.search(content)
+    if tag is None:
+        return None
+    value = VALUE_PATTERN.search(tag.group())
+    if value is None:
+        return None
+    return (value.group(1) or value.group(2) or b"").decode("ascii", errors="replace")
+
+
+def parse_verification_token(content: bytes) -> str | None:
+    page = BeautifulSoup(content, "html.parser")
+    token_input = page.find("input", {"name": VERIFICATION_TOKEN_FIELD})
+    if not isinstance(token_input, Tag):
+        return None
+    value = token_input.get("value")
+    return value if isinstance(value, str) else None
+
+
+async def extract_verification_token(content: bytes) -> str:
+    """Finds the anti-forgery token of the login form.
+
+    The targeted extractor handles the usual page. When its result does not look like a token, the page is parsed in
+    full on a worker thread instead, so the event loop keeps serving other monitors during a burst of logins.
+    """
+    token = find_verification_token(content)
+    if token is not None and VALID_TOKEN_PATTERN.fullmatch(token):
+        return token
+
+    logger.warning("Falling back to parsing the whole login page for the verification token.")
+    token = await asyncio.to_thread(parse_verification_token, content)
+    if token is None:
+        raise AuthenticationError("The login page has no verification token.")
+    return token
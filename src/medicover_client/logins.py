@@ -0,0 +1,128 @@
+import asyncio
+import heapq
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from itertools import count
+from typing import TypedDict
+
+from src.monitoring.metrics import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+LOGIN_CONCURRENCY = 2
+LOGIN_SPACING = 1.0
+LOGIN_JITTER = 0.5
+
+
+class LoginProgress(TypedDict):
+    waiting: int
+    running: int
+    succeeded: int
+    failed: int
+    wait_p95: float | None
+    duration_p95: float | None
+
+
+class LoginOrchestrator:
+    """Queues full sign-ins so that a restart or a mass session invalidation does not run them all at once.
+
+    At most ``concurrency`` logins run at the same time and consecutive logins start ``spacing`` seconds apart,
+    each gap varied by up to ``jitter`` of itself. Waiting logins start in order of priority, highest first, so users
+    whose monitors are about to open recover before the rest.
+    """
+
+    def __init__(
+        self, concurrency: int = LOGIN_CONCURRENCY, spacing: float = LOGIN_SPACING, jitter: float = LOGIN_JITTER
+    ) -> None:
+        self.concurrency = concurrency
+        self.spacing = spacing
+        self.jitter = jitter
+        self.succeeded = 0
+        self.failed = 0
+        self.wait_times = LatencyStats()
+        self.durations = LatencyStats()
+        self._waiting: list[tuple[float, int, asyncio.Future[float]]] = []
+        self._sequence = count()
+        self._running = 0
+        self._next_start = 0.0
+
+    def configure(self, concurrency: int, spacing: float) -> None:
+        if concurrency < 1 or spacing < 0:
+            raise ValueError("Login concurrency must be positive and the spacing must not be negative.")
+        self.concurrency = concurrency
+        self.spacing = spacing
+
+    @property
+    def progress(self) -> LoginProgress:
+        return LoginProgress(
+            waiting=len(self._waiting),
+            running=self._running,
+            succeeded=self.succeeded,
+            failed=self.failed,
+            wait_p95=self.wait_times.percentile(95),
+            duration_p95=self.durations.percentile(95),
+        )
+
+    async def run(self, log_in: Callable[[], Awaitable[None]], priority: float = 1.0) -> None:
+        queued_at = time.monotonic()
+        granted: asyncio.Future[float] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (-priority, next(self._sequence), granted))
+        self._grant()
+
+        try:
+            start_at = await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                self._release()
+            raise
+
+        try:
+            await asyncio.sleep(start_at - time.monotonic())
+            started_at = time.monotonic()
+            self.wait_times.record(started_at - queued_at)
+            await log_in()
+            self.durations.record(time.monotonic() - started_at)
+            self.succeeded += 1
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._release()
+            self._log_progress()
+
+    def _grant(self) -> None:
+        while self._waiting and self._running < self.concurrency:
+            _, _, granted = heapq.heappop(self._waiting)
+            if granted.cancelled():
+                continue
+            start_at = max(time.monotonic(), self._next_start)
+            self._next_start = start_at + self.spacing * random.uniform(1 - self.jitter, 1 + self.jitter)
+            self._running += 1
+            granted.set_result(start_at)
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._grant()
+
+    def _log_progress(self) -> None:
+        progress = self.progress
+        if progress["waiting"] or progress["running"]:
+            logger.info(
+                "Logins: %s done, %s failed, %s running, %s waiting.",
+                progress["succeeded"],
+                progress["failed"],
+                progress["running"],
+                progress["waiting"],
+            )
+        else:
+            logger.info(
+                "Login queue drained: %s done, %s failed, waits: %s.",
+                progress["succeeded"],
+                progress["failed"],
+                self.wait_times.summary(),
+            )
+
+
+login_orchestrator = LoginOrchestrator()
@@ -0,0 +1,37 @@
+from collections.abc import Sequence
+
+from src.medicover_client.slots import MINUTES_PER_DAY, Slot, SlotWindow
+
+try:
+    import numpy as np
+except ImportError:
+    # numpy is an optional dependency (the "vectorized" extra), windows are matched one by one without it.
+    np = None  # type: ignore[assignment]
+
+# Bounds the boolean mask to roughly this many cells so huge batches do not allocate it all at once.
+MAX_MASK_CELLS = 4_000_000
+
+
+def match_windows(slots: Sequence[Slot], windows: Sequence[SlotWindow]) -> list[list[Slot]]:
+    """Applies every window to the same slots and returns the matches in the order of ``windows``.
+
+    With numpy available the slot times are converted to an array once and each window becomes a vectorized mask,
+    which replaces ``len(windows)`` Python loops over all slots.
+    """
+    if np is None or len(windows) <= 1 or not slots:
+        return [window.filter(slots) for window in windows]
+
+    minutes = np.fromiter((slot.appointment_minutes for slot in slots), dtype=np.int64, count=len(slots))
+    minutes_of_day = minutes % MINUTES_PER_DAY
+    bounds = np.array([window.bounds() for window in windows], dtype=np.int64)
+
+    matches: list[list[Slot]] = []
+    chunk_size = max(1, MAX_MASK_CELLS // len(slots))
+    for start in range(0, len(windows), chunk_size):
+        last_minute, first_minute_of_day, last_minute_of_day = bounds[start : start + chunk_size].T[:, :, np.newaxis]
+        mask = (
+            (minutes <= last_minute) & (first_minute_of_day <= minutes_of_day) & (minutes_of_day <= last_minute_of_day)
+        )
+        matches += [[slots[index] for index in np.flatnonzero(row).tolist()] for row in mask]
+
+    return matches
@@ -0,0 +1,16 @@
+from typing import TypedDict
+
+SESSION_VERSION = 1
+
+
+class MedicoverSession(TypedDict):
+    """What is persisted of a signed-in ``MedicoverClient``; the client itself is rebuilt from it on demand."""
+
+    version: int
+    session_id: str
+    username: str
+    password: str
+    token: str
+    token_expires_at: float | None
+    refresh_token: str | None
+    sign_in_cookie: str | None
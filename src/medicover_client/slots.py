@@ -0,0 +1,137 @@
+import sys
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime, time, timedelta
+from typing import NamedTuple
+
+from src.medicover_client.types import SlotItem
+
+EPOCH = datetime(1970, 1, 1)
+MINUTE = timedelta(minutes=1)
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_epoch_minutes(moment: datetime) -> int:
+    """Minutes since the epoch of the wall-clock time, ignoring any timezone offset."""
+    return (moment.replace(tzinfo=None) - EPOCH) // MINUTE
+
+
+class Slot:
+    """Compact slot record parsed once per response, with the appointment time stored as epoch minutes."""
+
+    __slots__ = (
+        "appointment_minutes",
+        "booking_string",
+        "clinic_id",
+        "clinic_name",
+        "doctor_id",
+        "doctor_name",
+        "specialty_id",
+        "specialty_name",
+        "visit_type",
+    )
+
+    def __init__(
+        self,
+        appointment_minutes: int,
+        booking_string: str,
+        clinic_id: str,
+        clinic_name: str,
+        doctor_id: str,
+        doctor_name: str,
+        specialty_id: str,
+        specialty_name: str,
+        visit_type: str,
+    ) -> None:
+        self.appointment_minutes = appointment_minutes
+        self.booking_string = booking_string
+        # The same clinics, doctors and specialties repeat across thousands of slots.
+        self.clinic_id = sys.intern(clinic_id)
+        self.clinic_name = sys.intern(clinic_name)
+        self.doctor_id = sys.intern(doctor_id)
+        self.doctor_name = sys.intern(doctor_name)
+        self.specialty_id = sys.intern(specialty_id)
+        self.specialty_name = sys.intern(specialty_name)
+        self.visit_type = sys.intern(visit_type)
+
+    @classmethod
+    def from_item(cls, item: SlotItem) -> "Slot":
+        return cls(
+            to_epoch_minutes(datetime.fromisoformat(item["appointmentDate"])),
+            item["bookingString"],
+            str(item["clinic"]["id"]),
+            item["clinic"]["name"],
+            str(item["doctor"]["id"]),
+            item["doctor"]["name"],
+            str(item["specialty"]["id"]),
+            item["specialty"]["name"],
+            item["visitType"],
+        )
+
+    @property
+    def appointment_date(self) -> datetime:
+        return EPOCH + self.appointment_minutes * MINUTE
+
+    @property
+    def minute_of_day(self) -> int:
+        return self.appointment_minutes % MINUTES_PER_DAY
+
+    def __repr__(self) -> str:
+        return f"Slot({self.appointment_date.isoformat()}, {self.doctor_name!r}, {self.clinic_name!r})"
+
+
+class SlotQuery(NamedTuple):
+    region_id: str
+    specialization_id: str
+    from_date: date
+    clinic_id: str | None = None
+    doctor_id: str | None = None
+    to_date: date | None = None
+
+
+class SlotWindow(NamedTuple):
+    to_date: date | None = None
+    from_time: time | None = None
+    to_time: time | None = None
+
+    def bounds(self) -> tuple[int, int, int]:
+        """Last accepted epoch minute and the first and last accepted minute of the day."""
+        last_minute = (
+            to_epoch_minutes(datetime.combine(self.to_date, time.max)) if self.to_date is not None else sys.maxsize
+        )
+        first_minute_of_day = self.from_time.hour * 60 + self.from_time.minute if self.from_time else 0
+        last_minute_of_day = self.to_time.hour * 60 + self.to_time.minute if self.to_time else MINUTES_PER_DAY
+        return last_minute, first_minute_of_day, last_minute_of_day
+
+    def filter(self, slots: Iterable[Slot]) -> list[Slot]:
+        last_minute, first_minute_of_day, last_minute_of_day = self.bounds()
+
+        return [
+            slot
+            for slot in slots
+            if slot.appointment_minutes <= last_minute
+            and first_minute_of_day <= slot.appointment_minutes % MINUTES_PER_DAY <= last_minute_of_day
+        ]
+
+
+def demultiplex_slots(slots: Iterable[Slot], queries: Sequence[SlotQuery]) -> dict[SlotQuery, list[Slot]]:
+    """Split the slots of one shared or packed search back out to the queries it answers."""
+    queries_by_specialty: defaultdict[str, list[tuple[SlotQuery, int, int]]] = defaultdict(list)
+    for query in queries:
+        first_minute = to_epoch_minutes(datetime.combine(query.from_date, time.min))
+        last_minute = (
+            to_epoch_minutes(datetime.combine(query.to_date, time.max)) if query.to_date is not None else sys.maxsize
+        )
+        queries_by_specialty[query.specialization_id].append((query, first_minute, last_minute))
+
+    results: dict[SlotQuery, list[Slot]] = {query: [] for query in queries}
+    for slot in slots:
+        for query, first_minute, last_minute in queries_by_specialty.get(slot.specialty_id, ()):
+            if (
+                first_minute <= slot.appointment_minutes <= last_minute
+                and (query.clinic_id is None or query.clinic_id == slot.clinic_id)
+                and (query.doctor_id is None or query.doctor_id == slot.doctor_id)
+            ):
+                results[query].append(slot)
+
+    return results
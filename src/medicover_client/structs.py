@@ -0,0 +1,56 @@
+from collections.abc import Iterator
+from datetime import datetime
+
+import msgspec
+
+from src.medicover_client.slots import Slot, to_epoch_minutes
+from src.medicover_client.types import AppointmentItem
+
+
+class NamedEntity(msgspec.Struct):
+    id: str | int
+    name: str
+
+
+class SlotStruct(msgspec.Struct, rename="camel"):
+    appointment_date: datetime
+    booking_string: str
+    clinic: NamedEntity
+    doctor: NamedEntity
+    specialty: NamedEntity
+    visit_type: str
+
+
+class SlotPage(msgspec.Struct):
+    items: list[SlotStruct]
+
+
+class AppointmentPage(msgspec.Struct):
+    items: list[AppointmentItem] = []
+
+
+# Fields that are not declared above are skipped by the decoder without being materialised.
+slot_page_decoder = msgspec.json.Decoder(SlotPage)
+appointment_page_decoder = msgspec.json.Decoder(AppointmentPage)
+
+
+def decode_slots(content: bytes) -> Iterator[Slot]:
+    items = slot_page_decoder.decode(content).items
+    return (
+        Slot(
+            to_epoch_minutes(item.appointment_date),
+            item.booking_string,
+            str(item.clinic.id),
+            item.clinic.name,
+            str(item.doctor.id),
+            item.doctor.name,
+            str(item.specialty.id),
+            item.specialty.name,
+            item.visit_type,
+        )
+        for item in items
+    )
+
+
+def decode_appointments(content: bytes) -> list[AppointmentItem]:
+    return appointment_page_decoder.decode(content).items
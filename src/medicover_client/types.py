@@ -45,3 +45,7 @@ class SlotItem(TypedDict):
     doctor: Doctor
     specialty: Specialty
     visitType: str
+
+
+class BookedAppointment(TypedDict):
+    appointmentId: str
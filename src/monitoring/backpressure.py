@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 8
+LATENCY_TARGET = 5.0
+LATENCY_SAMPLES = 50
+DECREASE_FACTOR = 0.5
+DECREASE_COOLDOWN = 10.0
+
+
+class AIMDLimiter:
+    """Concurrency limit on upstream polling driven by additive increase and multiplicative decrease.
+
+    Every successful request grows the limit by ``1 / limit``, so a full window of successes adds one slot. A 429, a
+    5xx, a transport error or a p95 latency above ``latency_target`` multiplies the limit by ``decrease_factor``, at
+    most once per ``decrease_cooldown`` seconds so that one burst of failures is not punished repeatedly.
+    """
+
+    def __init__(
+        self,
+        min_limit: int = MIN_CONCURRENCY,
+        max_limit: int = MAX_CONCURRENCY,
+        latency_target: float = LATENCY_TARGET,
+        decrease_factor: float = DECREASE_FACTOR,
+        decrease_cooldown: float = DECREASE_COOLDOWN,
+    ) -> None:
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.limit = float(max_limit)
+        self.in_use = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._decreased_at = -math.inf
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def current_limit(self) -> int:
+        return int(self.limit)
+
+    @property
+    def p95_latency(self) -> float | None:
+        if len(self._latencies) < LATENCY_SAMPLES // 2:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+    async def acquire(self) -> None:
+        while self.in_use >= self.current_limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_use += 1
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake_waiters()
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *args: object) -> None:
+        self.release()
+
+    def record(self, latency: float, status_code: int | None) -> None:
+        """Feed the outcome of one upstream request; ``status_code`` is None when no response was received."""
+        self._latencies.append(latency)
+
+        if (
+            status_code is None
+            or status_code == httpx.codes.TOO_MANY_REQUESTS
+            or httpx.codes.is_server_error(status_code)
+        ):
+            self._decrease(f"upstream answered {status_code}" if status_code else "upstream request failed")
+            return
+
+        p95_latency = self.p95_latency
+        if p95_latency is not None and p95_latency > self.latency_target:
+            self._decrease(f"p95 latency is {p95_latency:.2f}s")
+            return
+
+        if self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._wake_waiters()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        if now - self._decreased_at < self.decrease_cooldown:
+            return
+
+        self._decreased_at = now
+        self._latencies.clear()
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+        logger.warning("Reducing upstream polling concurrency to %s: %s.", self.current_limit, reason)
+
+    def _wake_waiters(self) -> None:
+        free = self.current_limit - self.in_use
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+polling_limiter = AIMDLimiter()
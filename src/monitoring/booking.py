@@ -0,0 +1,45 @@
+import logging
+import time
+from collections.abc import Sequence
+
+from httpx import HTTPError, HTTPStatusError, codes
+
+from src.medicover_client.client import MedicoverClient
+from src.medicover_client.slots import Slot
+from src.monitoring.metrics import booking_latency
+
+logger = logging.getLogger(__name__)
+
+MAX_BOOKING_ATTEMPTS = 3
+SLOT_TAKEN_STATUS_CODES = frozenset({codes.CONFLICT, codes.GONE})
+
+
+async def book_first_available(client: MedicoverClient, slots: Sequence[Slot], matched_at: float) -> Slot | None:
+    """Books the earliest of ``slots`` that is still free, trying at most ``MAX_BOOKING_ATTEMPTS`` of them.
+
+    The booking goes out over the client's pooled connection, which the slot search that found the slots has just
+    used, so it needs neither a login nor a new handshake. ``matched_at`` is the ``time.perf_counter()`` reading
+    taken when the slots were matched and is used to measure the match-to-booking latency. Only a slot that has
+    already been taken moves on to the next one; any other failure returns None, so the caller notifies the user.
+    """
+    for slot in sorted(slots, key=lambda slot: slot.appointment_minutes)[:MAX_BOOKING_ATTEMPTS]:
+        try:
+            await client.book_slot(slot.booking_string)
+        except HTTPStatusError as error:
+            if error.response.status_code in SLOT_TAKEN_STATUS_CODES:
+                logger.warning("The slot at %s has already been taken, trying the next one.", slot.appointment_date)
+                continue
+            # Any other refusal would hit the remaining slots just the same, so the user is notified instead.
+            logger.warning("Booking the slot at %s failed with %s.", slot.appointment_date, error.response.status_code)
+            return None
+        except HTTPError:
+            logger.exception("Booking the slot at %s failed.", slot.appointment_date)
+            return None
+
+        booking_latency.record(time.perf_counter() - matched_at)
+        logger.info(
+            "Booked the slot at %s, match-to-booking latency: %s.", slot.appointment_date, booking_latency.summary()
+        )
+        return slot
+
+    return None
@@ -0,0 +1,87 @@
+import math
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+
+from src.medicover_client.slots import Slot
+from src.monitoring.scheduler import DEFAULT_POLL_INTERVAL
+from src.monitoring.seen import slot_key
+
+MIN_POLL_INTERVAL = 10.0
+MAX_POLL_INTERVAL = 300.0
+CHURN_SMOOTHING = 0.3
+MAX_TRACKED_QUERIES = 10_000
+
+
+class QueryChurn:
+    __slots__ = ("fingerprint", "rate")
+
+    def __init__(self, fingerprint: int, rate: float) -> None:
+        self.fingerprint = fingerprint
+        self.rate = rate
+
+
+class QueryChurnTracker:
+    """Tracks how often the slot set of each query changes between polls and derives its polling interval.
+
+    The change rate is an exponential moving average of "did the slot set differ from the previous poll". Queries
+    that always change poll every ``min_interval`` seconds and queries that never change back off to
+    ``max_interval``, interpolated geometrically in between.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = MIN_POLL_INTERVAL,
+        max_interval: float = MAX_POLL_INTERVAL,
+        smoothing: float = CHURN_SMOOTHING,
+        max_queries: int = MAX_TRACKED_QUERIES,
+    ) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        self.max_queries = max_queries
+        self._queries: OrderedDict[Hashable, QueryChurn] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def configure(self, min_interval: float, max_interval: float) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Polling interval bounds must satisfy 0 < min_interval <= max_interval.")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+    def observe(self, query: Hashable, slots: Sequence[Slot]) -> None:
+        # Booking strings may be re-issued between polls, so a slot is identified by its doctor, clinic and time.
+        fingerprint = hash(frozenset(map(slot_key, slots)))
+
+        churn = self._queries.get(query)
+        if churn is None:
+            self._queries[query] = QueryChurn(fingerprint, self._initial_rate())
+            if len(self._queries) > self.max_queries:
+                self._queries.popitem(last=False)
+            return
+
+        self._queries.move_to_end(query)
+        changed = fingerprint != churn.fingerprint
+        churn.rate += self.smoothing * (changed - churn.rate)
+        churn.fingerprint = fingerprint
+
+    def interval_for(self, query: Hashable, priority: float = 1.0) -> float:
+        """Polling interval of ``query`` divided by ``priority``, kept within the configured bounds."""
+        churn = self._queries.get(query)
+        rate = churn.rate if churn is not None else self._initial_rate()
+        interval = self.min_interval * math.pow(self.max_interval / self.min_interval, 1 - rate) / priority
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def forget(self, query: Hashable) -> None:
+        self._queries.pop(query, None)
+
+    def _initial_rate(self) -> float:
+        # New queries start at the rate that maps to the default interval, clamped into the configured bounds.
+        if self.max_interval == self.min_interval:
+            return 1.0
+        start = min(max(DEFAULT_POLL_INTERVAL, self.min_interval), self.max_interval)
+        return 1 - math.log(start / self.min_interval) / math.log(self.max_interval / self.min_interval)
+
+
+query_churn_tracker = QueryChurnTracker()
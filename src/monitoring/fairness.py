@@ -0,0 +1,65 @@
+import heapq
+from collections.abc import Hashable
+from datetime import date
+from itertools import count
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+SOON_WINDOW_DAYS = 3
+SOON_WINDOW_PRIORITY = 2.0
+
+
+class FairQueue(Generic[T]):
+    """Weighted fair queue (self-clocked) over flows, such as the users owning the queued monitors.
+
+    Every item gets a virtual finish tag of ``max(virtual time, previous tag of its flow) + 1 / weight`` and items
+    leave in tag order. A flow with twenty items therefore takes turns with a flow holding one instead of going
+    first, and an item with weight 2 counts as half a turn of its flow.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int, Hashable, T]] = []
+        self._sequence = count()
+        self._finish_tags: dict[Hashable, float] = {}
+        self._virtual_time = 0.0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item: T, flow: Hashable, weight: float = 1.0) -> None:
+        finish_tag = max(self._virtual_time, self._finish_tags.get(flow, 0.0)) + 1 / weight
+        self._finish_tags[flow] = finish_tag
+        heapq.heappush(self._heap, (finish_tag, next(self._sequence), flow, item))
+
+    def pop(self) -> T:
+        finish_tag, _, flow, item = heapq.heappop(self._heap)
+        self._virtual_time = finish_tag
+        # A flow whose last item left has nothing queued, so its tag no longer matters.
+        if self._finish_tags.get(flow) == finish_tag:
+            del self._finish_tags[flow]
+        return item
+
+
+class PriorityPolicy:
+    """Weights monitors whose window opens in the future, at most ``soon_days`` from today, by ``soon_priority``.
+
+    Windows that have already started get no boost, since the date picker starts most windows today. The weight is
+    used both as the monitor's share in the fair queue and as a divisor of its polling interval.
+    """
+
+    def __init__(self, soon_days: int = SOON_WINDOW_DAYS, soon_priority: float = SOON_WINDOW_PRIORITY) -> None:
+        self.soon_days = soon_days
+        self.soon_priority = soon_priority
+
+    def configure(self, soon_days: int, soon_priority: float) -> None:
+        if soon_days < 0 or soon_priority <= 0:
+            raise ValueError("Priority days must not be negative and the priority must be positive.")
+        self.soon_days = soon_days
+        self.soon_priority = soon_priority
+
+    def priority_for(self, window_start: date, today: date) -> float:
+        return self.soon_priority if 0 < (window_start - today).days <= self.soon_days else 1.0
+
+
+priority_policy = PriorityPolicy()
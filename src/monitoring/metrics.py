@@ -0,0 +1,32 @@
+import math
+from collections import deque
+
+LATENCY_SAMPLES = 1000
+
+
+class LatencyStats:
+    """Keeps the most recent ``max_samples`` latencies for percentile reporting."""
+
+    def __init__(self, max_samples: int = LATENCY_SAMPLES) -> None:
+        self.count = 0
+        self._samples: deque[float] = deque(maxlen=max_samples)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> float | None:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+    def summary(self) -> str:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        if p50 is None or p95 is None:
+            return "no samples"
+        return f"{self.count} samples, p50 {p50 * 1000:.1f}ms, p95 {p95 * 1000:.1f}ms"
+
+
+# Time from a monitor seeing a new matching slot to the booking request returning.
+booking_latency = LatencyStats()
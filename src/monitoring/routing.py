@@ -0,0 +1,151 @@
+from collections import Counter
+from datetime import date
+from typing import NamedTuple
+
+from src.medicover_client.slots import SlotQuery
+from src.monitoring.scheduler import MonitorKey
+
+
+class RouteKey(NamedTuple):
+    region_id: str
+    specialization_id: str
+    clinic_id: str | None = None
+    doctor_id: str | None = None
+
+    @classmethod
+    def from_query(cls, query: SlotQuery) -> "RouteKey":
+        return cls(query.region_id, query.specialization_id, query.clinic_id, query.doctor_id)
+
+    @property
+    def is_broad(self) -> bool:
+        return self.clinic_id is None and self.doctor_id is None
+
+    @property
+    def broad(self) -> "RouteKey":
+        return RouteKey(self.region_id, self.specialization_id)
+
+
+class Route:
+    """One upstream query shared by every monitor routed to it."""
+
+    __slots__ = ("earliest_from_date", "from_dates", "key", "latest_to_date", "members", "to_dates")
+
+    def __init__(self, key: RouteKey) -> None:
+        self.key = key
+        self.members: dict[MonitorKey, SlotQuery] = {}
+        self.from_dates: Counter[date] = Counter()
+        self.earliest_from_date = date.max
+        # Open-ended monitors count as date.max so the latest end date is a plain maximum.
+        self.to_dates: Counter[date] = Counter()
+        self.latest_to_date = date.min
+
+    def add(self, monitor_key: MonitorKey, query: SlotQuery) -> None:
+        to_date = query.to_date or date.max
+        self.members[monitor_key] = query
+        self.from_dates[query.from_date] += 1
+        self.earliest_from_date = min(self.earliest_from_date, query.from_date)
+        self.to_dates[to_date] += 1
+        self.latest_to_date = max(self.latest_to_date, to_date)
+
+    def remove(self, monitor_key: MonitorKey) -> SlotQuery | None:
+        query = self.members.pop(monitor_key, None)
+        if query is None:
+            return None
+
+        self.from_dates[query.from_date] -= 1
+        if not self.from_dates[query.from_date]:
+            del self.from_dates[query.from_date]
+            if query.from_date == self.earliest_from_date:
+                self.earliest_from_date = min(self.from_dates, default=date.max)
+
+        to_date = query.to_date or date.max
+        self.to_dates[to_date] -= 1
+        if not self.to_dates[to_date]:
+            del self.to_dates[to_date]
+            if to_date == self.latest_to_date:
+                self.latest_to_date = max(self.to_dates, default=date.min)
+        return query
+
+    def query(self, today: date) -> SlotQuery:
+        """Search covering every member: from the earliest start date, but not before today, to the latest end date."""
+        return SlotQuery(
+            region_id=self.key.region_id,
+            specialization_id=self.key.specialization_id,
+            from_date=max(today, self.earliest_from_date),
+            clinic_id=self.key.clinic_id,
+            doctor_id=self.key.doctor_id,
+            to_date=None if self.latest_to_date == date.max else self.latest_to_date,
+        )
+
+
+class RoutingIndex:
+    """Maps normalized query keys to the monitors that can be answered from them.
+
+    A clinic- or doctor-specific monitor joins the region and specialty route when one exists, because that
+    response already contains its slots. Adding, removing and looking up a monitor's route are dictionary operations;
+    only creating a broad route moves the specific routes of the same region and specialty onto it, and removing the
+    last broad monitor of a route splits its specific monitors back onto their own, narrower routes.
+    """
+
+    def __init__(self) -> None:
+        self._routes: dict[RouteKey, Route] = {}
+        self._route_of: dict[MonitorKey, Route] = {}
+        self._specific: dict[RouteKey, set[RouteKey]] = {}
+
+    def __len__(self) -> int:
+        return len(self._routes)
+
+    def add(self, monitor_key: MonitorKey, query: SlotQuery) -> Route:
+        self.remove(monitor_key)
+
+        key = RouteKey.from_query(query)
+        route = self._routes.get(key.broad) or self._routes.get(key)
+        if route is None:
+            route = self._routes[key] = Route(key)
+            if key.is_broad:
+                self._merge_specific_routes(route)
+            else:
+                self._specific.setdefault(key.broad, set()).add(key)
+
+        route.add(monitor_key, query)
+        self._route_of[monitor_key] = route
+        return route
+
+    def remove(self, monitor_key: MonitorKey) -> None:
+        route = self._route_of.pop(monitor_key, None)
+        if route is None:
+            return
+
+        query = route.remove(monitor_key)
+        if query is not None and route.key.is_broad and RouteKey.from_query(query).is_broad and route.members:
+            # A narrow query is far less likely to hit the page size than the broad one its monitors shared.
+            if not any(RouteKey.from_query(member).is_broad for member in route.members.values()):
+                self._split_broad_route(route)
+                return
+        if not route.members:
+            del self._routes[route.key]
+            if not route.key.is_broad:
+                specific = self._specific[route.key.broad]
+                specific.discard(route.key)
+                if not specific:
+                    del self._specific[route.key.broad]
+
+    def route_for(self, monitor_key: MonitorKey) -> Route | None:
+        return self._route_of.get(monitor_key)
+
+    def _split_broad_route(self, broad_route: Route) -> None:
+        del self._routes[broad_route.key]
+        for monitor_key in broad_route.members:
+            del self._route_of[monitor_key]
+        for monitor_key, query in broad_route.members.items():
+            self.add(monitor_key, query)
+
+    def _merge_specific_routes(self, broad_route: Route) -> None:
+        for key in self._specific.pop(broad_route.key, set()):
+            route = self._routes.pop(key)
+            for monitor_key, query in route.members.items():
+                broad_route.add(monitor_key, query)
+                self._route_of[monitor_key] = broad_route
+
+
+routing_index = RoutingIndex()
@@ -0,0 +1,209 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from itertools import count
+
+from src.monitoring.backpressure import MAX_CONCURRENCY, AIMDLimiter, polling_limiter
+from src.monitoring.fairness import FairQueue
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 30.0
+DEFAULT_WORKERS = MAX_CONCURRENCY
+MAX_FAILURE_BACKOFF = 600.0
+DEFAULT_BATCH_WINDOW = 1.0
+
+MonitorKey = tuple[int, str]
+
+
+class Monitor:
+    """A registered monitor. ``poll`` returns True once the monitor is finished and should be removed."""
+
+    def __init__(
+        self,
+        chat_id: int,
+        monitor_id: str,
+        poll: Callable[["Monitor"], Awaitable[bool]],
+        interval: float = DEFAULT_POLL_INTERVAL,
+        priority: float = 1.0,
+    ) -> None:
+        self.chat_id = chat_id
+        self.monitor_id = monitor_id
+        self.poll = poll
+        self.interval = interval
+        self.priority = priority
+        self.due_at = 0.0
+        self.last_polled_at: float | None = None
+        self.failures = 0
+
+    @property
+    def key(self) -> MonitorKey:
+        return self.chat_id, self.monitor_id
+
+
+class MonitorScheduler:
+    """Runs every monitor from one timer heap and a bounded pool of workers.
+
+    A dispatcher moves monitors whose due time has passed into a fair queue with one flow per chat, weighted by the
+    monitor's priority, and hands them to free workers in that order, optionally spacing the hand-offs by
+    ``pacing`` seconds. Monitors falling due within ``batch_window`` seconds of each other are moved together and
+    reported to ``due_listeners`` as one batch, which lets their searches be packed into fewer upstream requests.
+    After a poll the monitor is put back on the heap, so no coroutine sleeps per monitor.
+    Polls run under ``limiter``, which lowers the effective concurrency below ``workers`` when upstream struggles,
+    and a monitor whose poll raised backs off exponentially.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        pacing: float = 0.0,
+        limiter: AIMDLimiter | None = None,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+    ) -> None:
+        self.workers = workers
+        self.pacing = pacing
+        self.limiter = limiter
+        self.batch_window = batch_window
+        self.removal_listeners: list[Callable[[Monitor], None]] = []
+        self.due_listeners: list[Callable[[list[Monitor]], None]] = []
+        self._registry: dict[MonitorKey, Monitor] = {}
+        self._heap: list[tuple[float, int, Monitor]] = []
+        self._sequence = count()
+        self._due: FairQueue[Monitor] = FairQueue()
+        self._ready: asyncio.Queue[Monitor] = asyncio.Queue(maxsize=workers)
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def __len__(self) -> int:
+        return len(self._registry)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._dispatch(), name="monitor-scheduler-dispatcher")]
+        self._tasks += [
+            loop.create_task(self._work(), name=f"monitor-scheduler-worker-{number}") for number in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def register(self, monitor: Monitor, delay: float = 0.0) -> None:
+        self._registry[monitor.key] = monitor
+        self._schedule(monitor, time.monotonic() + delay)
+
+    def register_staggered(self, monitors: Sequence[Monitor], window: float) -> None:
+        """Registers many monitors at once with their first polls spread evenly over ``window`` seconds."""
+        step = window / len(monitors) if monitors else 0.0
+        for index, monitor in enumerate(monitors):
+            self.register(monitor, delay=index * step)
+
+    def unregister(self, chat_id: int, monitor_id: str) -> Monitor | None:
+        monitor = self._registry.pop((chat_id, monitor_id), None)
+        if monitor is not None:
+            for listener in self.removal_listeners:
+                listener(monitor)
+        return monitor
+
+    def get(self, chat_id: int, monitor_id: str) -> Monitor | None:
+        return self._registry.get((chat_id, monitor_id))
+
+    def due_in(self, key: MonitorKey) -> float | None:
+        monitor = self._registry.get(key)
+        return max(0.0, monitor.due_at - time.monotonic()) if monitor is not None else None
+
+    def monitors_for(self, chat_id: int) -> list[Monitor]:
+        return [monitor for (monitor_chat_id, _), monitor in self._registry.items() if monitor_chat_id == chat_id]
+
+    def _is_registered(self, monitor: Monitor) -> bool:
+        return self._registry.get(monitor.key) is monitor
+
+    def _schedule(self, monitor: Monitor, due_at: float) -> None:
+        monitor.due_at = due_at
+        heapq.heappush(self._heap, (due_at, next(self._sequence), monitor))
+        self._wakeup.set()
+
+    async def _dispatch(self) -> None:
+        while True:
+            self._wakeup.clear()
+            now = time.monotonic()
+
+            due: list[Monitor] = []
+            if self._heap and self._heap[0][0] <= now:
+                # Monitors due shortly after the first one are pulled forward so they are polled as one batch.
+                horizon = now + self.batch_window
+                while self._heap and self._heap[0][0] <= horizon:
+                    due_at, _, monitor = heapq.heappop(self._heap)
+                    # Entries of removed or replaced monitors are dropped lazily instead of being searched for.
+                    if self._is_registered(monitor) and monitor.due_at == due_at:
+                        self._due.push(monitor, flow=monitor.chat_id, weight=monitor.priority)
+                        due.append(monitor)
+            if due:
+                for listener in self.due_listeners:
+                    try:
+                        listener(due)
+                    except Exception:
+                        logger.exception("A due listener failed for %d monitors.", len(due))
+
+            while self._due and not self._ready.full():
+                monitor = self._due.pop()
+                if not self._is_registered(monitor):
+                    continue
+                self._ready.put_nowait(monitor)
+                if self.pacing:
+                    await asyncio.sleep(self.pacing)
+
+            timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except TimeoutError:
+                pass
+
+    async def _work(self) -> None:
+        while True:
+            monitor = await self._ready.get()
+            # A free place in the ready queue lets the dispatcher hand over the next monitor in fair order.
+            self._wakeup.set()
+            finished = False
+            delay = monitor.interval
+            try:
+                finished = await self._poll(monitor)
+                monitor.failures = 0
+            except Exception:
+                monitor.failures += 1
+                delay = min(monitor.interval * 2**monitor.failures, MAX_FAILURE_BACKOFF)
+                logger.exception(
+                    "Polling monitor %s of chat %s failed, retrying in %.0f seconds.",
+                    monitor.monitor_id,
+                    monitor.chat_id,
+                    delay,
+                )
+            finally:
+                monitor.last_polled_at = time.monotonic()
+                self._ready.task_done()
+
+            if not self._is_registered(monitor):
+                continue
+            if finished:
+                self.unregister(monitor.chat_id, monitor.monitor_id)
+            else:
+                self._schedule(monitor, time.monotonic() + delay)
+
+    async def _poll(self, monitor: Monitor) -> bool:
+        if self.limiter is None:
+            return await monitor.poll(monitor)
+        async with self.limiter:
+            return await monitor.poll(monitor)
+
+
+monitor_scheduler = MonitorScheduler(limiter=polling_limiter)
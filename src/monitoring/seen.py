@@ -0,0 +1,123 @@
+import hashlib
+import math
+from collections import OrderedDict
+
+from src.medicover_client.slots import Slot
+
+SEEN_LRU_SIZE = 2048
+BLOOM_CAPACITY = 100_000
+BLOOM_ERROR_RATE = 0.001
+
+
+def slot_key(slot: Slot) -> str:
+    """Identity of a slot that stays stable between polls, unlike the booking string which may be re-issued."""
+    return f"{slot.doctor_id}:{slot.clinic_id}:{slot.appointment_minutes}"
+
+
+class BloomFilter:
+    """Two-generation Bloom filter with constant memory.
+
+    Keys go into the current generation. Once it holds ``capacity`` keys it becomes the previous generation and a
+    fresh one is started, so the oldest keys are forgotten instead of the false positive rate growing.
+    """
+
+    __slots__ = ("bit_count", "capacity", "count", "current", "hash_count", "previous")
+
+    def __init__(self, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE) -> None:
+        self.capacity = capacity
+        self.bit_count = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.bit_count / capacity * math.log(2)))
+        self.current = bytearray((self.bit_count + 7) // 8)
+        self.previous = bytearray(len(self.current))
+        self.count = 0
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._positions(key)
+        return self._contains(self.current, positions) or self._contains(self.previous, positions)
+
+    def add(self, key: str) -> None:
+        if self.count >= self.capacity:
+            self.previous, self.current = self.current, bytearray(len(self.current))
+            self.count = 0
+
+        for position in self._positions(key):
+            self.current[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def _positions(self, key: str) -> list[int]:
+        # Kirsch-Mitzenmacher double hashing derives every position from one 128-bit digest.
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.bit_count for index in range(self.hash_count)]
+
+    @staticmethod
+    def _contains(bits: bytearray, positions: list[int]) -> bool:
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+
+class SeenSlots:
+    """Per-monitor record of already reported slots with constant-time checks and bounded memory.
+
+    Keys are kept in an LRU set of up to ``max_size`` entries. Slots still on offer are touched on every poll, so the
+    evicted keys are those of slots that disappeared. A monitor whose single poll returns more slots than the LRU
+    can hold switches to a Bloom filter, trading exact answers for memory that does not depend on the slot count.
+    """
+
+    __slots__ = ("bloom", "lru", "max_size")
+
+    def __init__(self, max_size: int = SEEN_LRU_SIZE) -> None:
+        self.max_size = max_size
+        self.lru: OrderedDict[str, None] = OrderedDict()
+        self.bloom: BloomFilter | None = None
+
+    def __len__(self) -> int:
+        return self.bloom.count if self.bloom is not None else len(self.lru)
+
+    def add(self, key: str) -> bool:
+        """Remembers ``key`` and returns True if it has not been seen before."""
+        if self.bloom is not None:
+            if key in self.bloom:
+                return False
+            self.bloom.add(key)
+            return True
+
+        if key in self.lru:
+            self.lru.move_to_end(key)
+            return False
+
+        self.lru[key] = None
+        if len(self.lru) > self.max_size:
+            self.lru.popitem(last=False)
+        return True
+
+    def touch(self, key: str) -> bool:
+        """Returns True if ``key`` has been seen, moving it to the recent end of the LRU."""
+        if self.bloom is not None:
+            return key in self.bloom
+        if key in self.lru:
+            self.lru.move_to_end(key)
+            return True
+        return False
+
+    def filter_new(self, slots: list[Slot]) -> list[Slot]:
+        """Returns the slots not reported yet without remembering them, so a failed notification is retried."""
+        if self.bloom is None and len(slots) > self.max_size:
+            self._switch_to_bloom()
+
+        new_slots: dict[str, Slot] = {}
+        for slot in slots:
+            key = slot_key(slot)
+            if key not in new_slots and not self.touch(key):
+                new_slots[key] = slot
+        return list(new_slots.values())
+
+    def mark_seen(self, slots: list[Slot]) -> None:
+        for slot in slots:
+            self.add(slot_key(slot))
+
+    def _switch_to_bloom(self) -> None:
+        self.bloom = BloomFilter()
+        for key in self.lru:
+            self.bloom.add(key)
+        self.lru.clear()
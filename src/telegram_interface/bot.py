@@ -12,10 +12,16 @@ from telegram.ext import (
     CommandHandler,
     ConversationHandler,
     MessageHandler,
-    PicklePersistence,
     filters,
 )
 
+from src.medicover_client.budget import ACCOUNT_REQUESTS_PER_SECOND, GLOBAL_REQUESTS_PER_SECOND, request_budget
+from src.medicover_client.coalescer import slot_query_coalescer
+from src.medicover_client.logins import LOGIN_CONCURRENCY, LOGIN_SPACING, login_orchestrator
+from src.monitoring.backpressure import polling_limiter
+from src.monitoring.churn import MAX_POLL_INTERVAL, MIN_POLL_INTERVAL, query_churn_tracker
+from src.monitoring.fairness import SOON_WINDOW_DAYS, SOON_WINDOW_PRIORITY, priority_policy
+from src.monitoring.scheduler import monitor_scheduler
 from src.telegram_interface.commands.active_monitorings import active_monitorings_entrypoint, cancel_monitoring
 from src.telegram_interface.commands.future_appointments import future_appointments_entrypoint
 from src.telegram_interface.commands.login import login, password, username
@@ -51,6 +57,10 @@ from src.telegram_interface.commands.settings import (
     show_change_language,
 )
 from src.telegram_interface.commands.start import start_entrypoint
+from src.telegram_interface.lifecycle import lifecycle_manager
+from src.telegram_interface.monitors import forget_monitor, resume_monitors, search_due_routes
+from src.telegram_interface.persistence import SQLitePersistence
+from src.telegram_interface.sessions import medicover_clients, upgrade_legacy_clients
 from src.telegram_interface.states import (
     CANCEL_MONITORING,
     CHANGE_LANGUAGE,
@@ -75,6 +85,7 @@ from src.telegram_interface.states import (
     SHOW_CHANGE_LANGUAGE,
     VERIFY_SUMMARY,
 )
+from src.telegram_interface.webhook import file_base_url, webhook_settings_from_env
 
 logging.basicConfig(format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -94,6 +105,26 @@ async def post_init(application: Application[Any, Any, Any, Any, Any, Any]) -> N
             BotCommand("/help", "Show help message"),
         ]
     )
+    slot_query_coalescer.result_listeners.append(query_churn_tracker.observe)
+    slot_query_coalescer.outcome_listeners.append(polling_limiter.record)
+    medicover_clients.budget = request_budget
+    slot_query_coalescer.max_response_age = query_churn_tracker.max_interval
+    monitor_scheduler.removal_listeners.append(forget_monitor)
+    monitor_scheduler.due_listeners.append(search_due_routes)
+    medicover_clients.session_listeners.append(
+        lambda user_id: application.mark_data_for_update_persistence(user_ids=user_id)
+    )
+    upgrade_legacy_clients(application)
+    monitor_scheduler.start()
+    lifecycle_manager.sweep(application)
+    resume_monitors(application)
+    lifecycle_manager.start(application)
+
+
+async def post_shutdown(application: Application[Any, Any, Any, Any, Any, Any]) -> None:
+    await lifecycle_manager.stop()
+    await monitor_scheduler.stop()
+    await medicover_clients.aclose()
 
 
 async def end_current_command(*args: Any, **kwargs: Any) -> int:
@@ -103,18 +134,48 @@ async def end_current_command(*args: Any, **kwargs: Any) -> int:
 class TelegramBot:
     def __init__(self) -> None:
         source_folder = Path(__file__).resolve().parent.parent.parent
-        pickle_file_path = Path(os.environ["TELEGRAM_PERSISTENCE_PICKLE_FILE_PATH"])
-        file_path = source_folder / pickle_file_path
+        # A pickle file left by the previous PicklePersistence is imported into the database on the first start.
+        # Deployments that only configured the pickle file get a database next to it.
+        pickle_file_path = os.getenv("TELEGRAM_PERSISTENCE_PICKLE_FILE_PATH")
+        database_file_path = Path(
+            os.getenv("TELEGRAM_PERSISTENCE_DATABASE_FILE_PATH")
+            or Path(os.environ["TELEGRAM_PERSISTENCE_PICKLE_FILE_PATH"]).with_suffix(".sqlite3")
+        )
+
+        persistence = SQLitePersistence(
+            filepath=source_folder / database_file_path,
+            migrate_from=source_folder / pickle_file_path if pickle_file_path else None,
+        )
 
-        persistence = PicklePersistence(filepath=file_path)
+        query_churn_tracker.configure(
+            min_interval=float(os.getenv("MONITOR_MIN_POLL_INTERVAL", MIN_POLL_INTERVAL)),
+            max_interval=float(os.getenv("MONITOR_MAX_POLL_INTERVAL", MAX_POLL_INTERVAL)),
+        )
+        request_budget.configure(
+            global_rate=float(os.getenv("UPSTREAM_REQUESTS_PER_SECOND", GLOBAL_REQUESTS_PER_SECOND)),
+            account_rate=float(os.getenv("UPSTREAM_ACCOUNT_REQUESTS_PER_SECOND", ACCOUNT_REQUESTS_PER_SECOND)),
+        )
+        login_orchestrator.configure(
+            concurrency=int(os.getenv("LOGIN_CONCURRENCY", LOGIN_CONCURRENCY)),
+            spacing=float(os.getenv("LOGIN_SPACING", LOGIN_SPACING)),
+        )
+        priority_policy.configure(
+            soon_days=int(os.getenv("MONITOR_SOON_WINDOW_DAYS", SOON_WINDOW_DAYS)),
+            soon_priority=float(os.getenv("MONITOR_SOON_WINDOW_PRIORITY", SOON_WINDOW_PRIORITY)),
+        )
 
-        self.bot = (
+        builder = (
             ApplicationBuilder()
             .token(os.environ["TELEGRAM_BOT_TOKEN"])
             .post_init(post_init)
+            .post_shutdown(post_shutdown)
             .persistence(persistence)
-            .build()
         )
+        # Points the bot at a self-hosted Bot API server or a local fake of it, e.g. "http://127.0.0.1:8081/bot".
+        api_base_url = os.getenv("TELEGRAM_API_BASE_URL")
+        if api_base_url:
+            builder = builder.base_url(api_base_url).base_file_url(file_base_url(api_base_url))
+        self.bot = builder.build()
 
         start_handler = ConversationHandler(
             entry_points=[CommandHandler("start", start_entrypoint)],
@@ -294,4 +355,8 @@ class TelegramBot:
         self.bot.add_handler(settings_handler, 4)
         self.bot.add_handler(future_appointments_handler, 5)
 
-        self.bot.run_polling()
+        webhook_settings = webhook_settings_from_env()
+        if webhook_settings is None:
+            self.bot.run_polling()
+        else:
+            self.bot.run_webhook(**webhook_settings)
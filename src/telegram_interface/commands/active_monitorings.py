@@ -1,11 +1,12 @@
-import asyncio
 from typing import cast
 
 from telegram import CallbackQuery, Chat, InlineKeyboardButton, InlineKeyboardMarkup, Message, Update
 from telegram.ext import ContextTypes, ConversationHandler
 
 from src.locale_handler import _
+from src.monitoring.scheduler import monitor_scheduler
 from src.telegram_interface.helpers import get_summary_text
+from src.telegram_interface.sessions import get_medicover_client
 from src.telegram_interface.states import CANCEL_MONITORING
 from src.telegram_interface.user_data import UserDataDataclass
 
@@ -17,24 +18,22 @@ async def active_monitorings_entrypoint(update: Update, context: ContextTypes.DE
     update_message = cast(Message, update.message)
     user_data = cast(UserDataDataclass, context.user_data)
 
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
         return ConversationHandler.END
 
-    all_tasks = asyncio.all_tasks()
-    user_tasks = [task for task in all_tasks if task.get_name().startswith(f"{user_chat_id}_")]
+    user_monitors = monitor_scheduler.monitors_for(user_chat_id)
 
-    if not user_tasks:
+    if not user_monitors:
         await update_message.reply_text(_("No active monitorings.", user_data["language"]))
         return ConversationHandler.END
 
-    for task in user_tasks:
-        task_hash = task.get_name().split("_")[-1]
-        booking_number = user_data["booking_hashes"][task_hash]
+    for monitor in user_monitors:
+        booking_number = user_data["monitors"][monitor.monitor_id]["booking_number"]
 
         keyboard = [
-            [InlineKeyboardButton(_("Delete monitoring", user_data["language"]), callback_data=task.get_name())],
+            [InlineKeyboardButton(_("Delete monitoring", user_data["language"]), callback_data=monitor.monitor_id)],
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
 
@@ -56,16 +55,12 @@ async def cancel_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE)
     data = cast(str, query.data)
 
     user_data = cast(UserDataDataclass, context.user_data)
-    all_tasks = asyncio.all_tasks()
-    user_tasks = [task for task in all_tasks if task.get_name().startswith(f"{user_chat_id}_")]
+    if monitor_scheduler.unregister(user_chat_id, data) is not None:
+        user_data["booking_hashes"].pop(data, None)
+        user_data["monitors"].pop(data, None)
+        await query_message.edit_text(_("Monitoring has been deleted.", user_data["language"]))
 
-    for task in user_tasks:
-        if task.get_name() == data:
-            task.cancel()
-            user_data["booking_hashes"].pop(data.split("_")[-1])
-            await query_message.edit_text(_("Monitoring has been deleted.", user_data["language"]))
-
-    if not user_tasks:
+    if not monitor_scheduler.monitors_for(user_chat_id):
         await query_message.reply_text(_("No active monitorings.", user_data["language"]))
         return ConversationHandler.END
 
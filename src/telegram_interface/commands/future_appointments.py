@@ -5,27 +5,25 @@ from telegram import Message, Update
 from telegram.ext import ContextTypes, ConversationHandler
 
 from src.locale_handler import _
-from src.medicover_client.types import AppointmentItem
+from src.telegram_interface.sessions import get_medicover_client
 from src.telegram_interface.user_data import UserDataDataclass
 
 
 async def future_appointments_entrypoint(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_data = cast(UserDataDataclass, context.user_data)
     update_message = cast(Message, update.message)
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
         return ConversationHandler.END
 
-    future_appointments: list[AppointmentItem] = await client.get_future_appointments()
+    has_future_appointments = False
 
-    if not future_appointments:
-        await update_message.reply_text(_("You have no future appointments.", user_data["language"]))
-        return ConversationHandler.END
-
-    await update_message.reply_text(_("You have the following future appointments:", user_data["language"]))
+    async for future_appointment in client.iter_future_appointments():
+        if not has_future_appointments:
+            has_future_appointments = True
+            await update_message.reply_text(_("You have the following future appointments:", user_data["language"]))
 
-    for future_appointment in future_appointments:
         appointment_date = datetime.fromisoformat(future_appointment["date"])
         doctor_name = future_appointment["doctor"]["name"]
         clinic_name = future_appointment["clinic"]["name"]
@@ -38,4 +36,7 @@ async def future_appointments_entrypoint(update: Update, context: ContextTypes.D
             f"{_("Clinic:", user_data["language"])} {clinic_name}"
         )
 
+    if not has_future_appointments:
+        await update_message.reply_text(_("You have no future appointments.", user_data["language"]))
+
     return ConversationHandler.END
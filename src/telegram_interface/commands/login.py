@@ -1,11 +1,12 @@
 import logging
 from typing import cast
 
-from telegram import Message, Update
+from telegram import Message, Update, User
 from telegram.ext import ContextTypes, ConversationHandler
 
 from src.locale_handler import _
 from src.medicover_client.client import MedicoverClient
+from src.telegram_interface.sessions import medicover_clients
 from src.telegram_interface.states import PROVIDE_PASSWORD, PROVIDE_USERNAME
 from src.telegram_interface.user_data import UserDataDataclass
 
@@ -32,19 +33,21 @@ async def username(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 async def password(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_data = cast(UserDataDataclass, context.user_data)
     update_message = cast(Message, update.message)
+    user = cast(User, update.effective_user)
 
     user_data["password"] = cast(str, update_message.text)
     username = user_data["username"]
     password = user_data["password"]
 
-    medicover_client = MedicoverClient(username, password)
+    medicover_client = MedicoverClient(username, password, budget=medicover_clients.budget)
     try:
         await medicover_client.log_in()
-        user_data["medicover_client"] = medicover_client
+        await medicover_clients.set(user.id, user_data, medicover_client)
         await update_message.reply_text(_("Login attempt successful.", user_data["language"]))
         user_data["username"] = ""
         user_data["password"] = ""
         return ConversationHandler.END
     except Exception:
+        await medicover_client.aclose()
         await update_message.reply_text(_("Login failed. Please try again.", user_data["language"]))
         return await login(update, context)
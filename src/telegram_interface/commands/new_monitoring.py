@@ -1,7 +1,6 @@
-import asyncio
 import hashlib
 import logging
-from datetime import date, datetime, time
+from datetime import datetime
 from typing import cast
 
 import telegram
@@ -12,15 +11,18 @@ from telegram import (
     InlineKeyboardMarkup,
     Message,
     Update,
+    User,
 )
 from telegram.ext import ContextTypes, ConversationHandler
 
 from src.locale_handler import _
-from src.medicover_client.client import MedicoverClient
-from src.medicover_client.types import SlotItem
+from src.medicover_client.coalescer import slot_query_coalescer
 from src.telegram_interface.helpers import (
+    AUTO_BOOK_ANSWER,
     NO_ANSWER,
     YES_ANSWER,
+    get_slot_search,
+    get_slot_text,
     get_summary_text,
     handle_date_selection,
     handle_time_selection,
@@ -34,6 +36,9 @@ from src.telegram_interface.helpers import (
     update_date_selection_buttons,
     update_time_selection_buttons,
 )
+from src.telegram_interface.lifecycle import remember_recent
+from src.telegram_interface.monitors import create_monitor, create_monitor_record, schedule_monitor
+from src.telegram_interface.sessions import get_medicover_client
 from src.telegram_interface.states import (
     GET_CLINIC,
     GET_DOCTOR,
@@ -71,7 +76,7 @@ async def new_monitoring_entrypoint(update: Update, context: ContextTypes.DEFAUL
 
     user_data = cast(UserDataDataclass, context.user_data)
 
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         await message.reply_text(_("Please log in first.", user_data["language"]))
         return ConversationHandler.END
@@ -109,7 +114,7 @@ async def new_monitoring_entrypoint(update: Update, context: ContextTypes.DEFAUL
 
 async def get_location_from_buttons(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_data = cast(UserDataDataclass, context.user_data)
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         update_message = cast(Message, update.message)
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
@@ -123,6 +128,7 @@ async def get_location_from_buttons(update: Update, context: ContextTypes.DEFAUL
     location = next((item for item in user_data["history"]["locations"] if item["location_id"] == location_id), None)
     if not location:
         return ConversationHandler.END
+    remember_recent(user_data["history"]["locations"], location)
 
     location_text = location["location_name"]
 
@@ -131,7 +137,7 @@ async def get_location_from_buttons(update: Update, context: ContextTypes.DEFAUL
     if not bookings:
         user_data["bookings"] = {}
 
-    next_booking_number = next(reversed(user_data["bookings"])) + 1
+    next_booking_number = next(reversed(user_data["bookings"]), 0) + 1
 
     user_data["current_booking_number"] = next_booking_number
     user_data["bookings"][next_booking_number] = {"location": location}
@@ -155,7 +161,7 @@ async def get_location_from_buttons(update: Update, context: ContextTypes.DEFAUL
 
 async def get_location_from_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_data = cast(UserDataDataclass, context.user_data)
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         update_message = cast(Message, update.message)
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
@@ -188,7 +194,7 @@ async def get_location_from_input(update: Update, context: ContextTypes.DEFAULT_
 
 async def read_location(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_data = cast(UserDataDataclass, context.user_data)
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         update_message = cast(Message, update.message)
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
@@ -203,7 +209,7 @@ async def read_location(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     location_text = temp_locations[user_input_location_id]
     location = Location(location_id=user_input_location_id, location_name=location_text)
 
-    user_data["history"]["locations"].append(location)
+    remember_recent(user_data["history"]["locations"], location)
 
     bookings = user_data.get("bookings")
 
@@ -234,7 +240,7 @@ async def read_location(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
 
 async def get_specialization_from_buttons(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_data = cast(UserDataDataclass, context.user_data)
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         update_message = cast(Message, update.message)
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
@@ -250,6 +256,7 @@ async def get_specialization_from_buttons(update: Update, context: ContextTypes.
     )
     if not specialization:
         return ConversationHandler.END
+    remember_recent(user_data["history"]["specializations"], specialization)
 
     specialization_text = specialization["specialization_name"]
 
@@ -277,7 +284,7 @@ async def get_specialization_from_input(update: Update, context: ContextTypes.DE
     user_data = cast(UserDataDataclass, context.user_data)
     update_message = cast(Message, update.message)
 
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         update_message = cast(Message, update.message)
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
@@ -324,7 +331,7 @@ async def read_specialization(update: Update, context: ContextTypes.DEFAULT_TYPE
         specialization_id=user_input_specialization_id, specialization_name=specialization_text
     )
 
-    user_data["history"]["specializations"].append(specialization)
+    remember_recent(user_data["history"]["specializations"], specialization)
 
     booking_number = user_data["current_booking_number"]
     user_data["bookings"][booking_number]["specialization"] = specialization
@@ -347,7 +354,7 @@ async def read_specialization(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 async def get_clinic_from_buttons(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_data = cast(UserDataDataclass, context.user_data)
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         update_message = cast(Message, update.message)
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
@@ -376,6 +383,7 @@ async def get_clinic_from_buttons(update: Update, context: ContextTypes.DEFAULT_
         )
         if clinic is None:
             return ConversationHandler.END
+        remember_recent(user_data["history"]["clinics"][specialization_id], clinic)
 
     user_data["bookings"][current_booking_number]["clinic"] = clinic
     clinic_text = clinic["clinic_name"]
@@ -401,7 +409,7 @@ async def get_clinic_from_input(update: Update, context: ContextTypes.DEFAULT_TY
     user_data = cast(UserDataDataclass, context.user_data)
     update_message = cast(Message, update.message)
 
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         update_message = cast(Message, update.message)
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
@@ -453,7 +461,7 @@ async def read_clinic(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
         if specialization_id not in user_data["history"]["clinics"]:
             user_data["history"]["clinics"][specialization_id] = []
 
-        user_data["history"]["clinics"][specialization_id].append(clinic)
+        remember_recent(user_data["history"]["clinics"][specialization_id], clinic)
 
     user_data["bookings"][booking_number]["clinic"] = clinic
 
@@ -475,7 +483,7 @@ async def read_clinic(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 
 async def get_doctor_from_buttons(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_data = cast(UserDataDataclass, context.user_data)
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         update_message = cast(Message, update.message)
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
@@ -504,6 +512,7 @@ async def get_doctor_from_buttons(update: Update, context: ContextTypes.DEFAULT_
         )
         if doctor is None:
             return ConversationHandler.END
+        remember_recent(user_data["history"]["doctors"][specialization_id], doctor)
 
     user_data["bookings"][current_booking_number]["doctor"] = doctor
     doctor_text = doctor["doctor_name"]
@@ -527,7 +536,7 @@ async def get_doctor_from_input(update: Update, context: ContextTypes.DEFAULT_TY
     user_data = cast(UserDataDataclass, context.user_data)
     update_message = cast(Message, update.message)
 
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         update_message = cast(Message, update.message)
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
@@ -580,7 +589,7 @@ async def read_doctor(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
         if specialization_id not in user_data["history"]["doctors"]:
             user_data["history"]["doctors"][specialization_id] = []
 
-        user_data["history"]["doctors"][specialization_id].append(doctor)
+        remember_recent(user_data["history"]["doctors"][specialization_id], doctor)
 
     user_data["bookings"][booking_number]["doctor"] = doctor
 
@@ -928,59 +937,29 @@ async def verify_summary(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 
     current_booking_number = user_data["current_booking_number"]
 
-    location_id = user_data["bookings"][current_booking_number]["location"]["location_id"]
-    specialization_id = user_data["bookings"][current_booking_number]["specialization"]["specialization_id"]
-    clinic_id = user_data["bookings"][current_booking_number]["clinic"]["clinic_id"]
-    doctor_id = user_data["bookings"][current_booking_number]["doctor"]["doctor_id"]
-    from_date = user_data["bookings"][current_booking_number]["from_date"]
-    from_time = user_data["bookings"][current_booking_number]["from_time"]
-    to_date = user_data["bookings"][current_booking_number]["to_date"]
-    to_time = user_data["bookings"][current_booking_number]["to_time"]
-
     user_data["bookings"][current_booking_number]["booking_hash"] = hashlib.md5(summary_text.encode()).hexdigest()
 
     update_message = cast(Message, query.message)
 
-    client = user_data.get("medicover_client")
+    client = get_medicover_client(update, context)
     if not client:
         await update_message.reply_text(_("Please log in first.", user_data["language"]))
         return ConversationHandler.END
 
-    from_date_obj = date(
-        year=from_date["year"],
-        month=from_date["month"],
-        day=from_date["day"],
-    )
-
-    available_slots = await client.get_available_slots(
-        location_id,
-        specialization_id,
-        from_date_obj,
-        doctor_id,
-        clinic_id,
-    )
-
-    parsed_available_slot = []
-    from_time_obj = time(hour=from_time["hour"], minute=from_time["minute"])
-    to_time_obj = time(hour=to_time["hour"], minute=to_time["minute"])
-
-    to_date_obj = datetime(
-        year=to_date["year"],
-        month=to_date["month"],
-        day=to_date["day"],
-        hour=23,
-        minute=59,
-    )
-    for slot in available_slots:
-        appointment_date = datetime.fromisoformat(slot["appointmentDate"])
-        if from_time_obj <= appointment_date.time() <= to_time_obj and appointment_date <= to_date_obj:
-            parsed_available_slot.append(slot)
+    slot_query, slot_window = get_slot_search(user_data)
+    parsed_available_slot = await slot_query_coalescer.get_available_slots(client, slot_query, slot_window)
 
     if not parsed_available_slot:
         await query_message.reply_text(_("No appointments available for selected parameters.", user_data["language"]))
 
         keyboard = [
             [InlineKeyboardButton(_("Yes", user_data["language"]), callback_data=YES_ANSWER)],
+            [
+                InlineKeyboardButton(
+                    _("Yes, and book the first appointment automatically", user_data["language"]),
+                    callback_data=AUTO_BOOK_ANSWER,
+                )
+            ],
             [InlineKeyboardButton(_("No", user_data["language"]), callback_data=NO_ANSWER)],
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -994,83 +973,16 @@ async def verify_summary(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await query_message.reply_text(_("Available appointments:", user_data["language"]))
 
     for slot in parsed_available_slot:
-        # TODO fix the translation
-        await query_message.reply_text(
-            f"Lekarz: {slot["doctor"]["name"]}\nKlinika: {slot["clinic"]["name"]}\nData: {slot['appointmentDate']}"
-        )
+        await query_message.reply_text(get_slot_text(slot))
 
     # TODO add reserve slot
     return ConversationHandler.END
 
 
-async def create_monitoring_task(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    user_data = cast(UserDataDataclass, context.user_data)
-    query = cast(CallbackQuery, update.callback_query)
-    query_message = cast(Message, query.message)
-
-    client = cast(MedicoverClient, user_data["medicover_client"])
-
-    current_booking_number = user_data["current_booking_number"]
-
-    location_id = user_data["bookings"][current_booking_number]["location"]["location_id"]
-    specialization_id = user_data["bookings"][current_booking_number]["specialization"]["specialization_id"]
-    clinic_id = user_data["bookings"][current_booking_number]["clinic"]["clinic_id"]
-    doctor_id = user_data["bookings"][current_booking_number]["doctor"]["doctor_id"]
-    from_date = user_data["bookings"][current_booking_number]["from_date"]
-    from_time = user_data["bookings"][current_booking_number]["from_time"]
-    to_date = user_data["bookings"][current_booking_number]["to_date"]
-    to_time = user_data["bookings"][current_booking_number]["to_time"]
-
-    from_date_obj = date(
-        year=from_date["year"],
-        month=from_date["month"],
-        day=from_date["day"],
-    )
-
-    from_time_obj = time(hour=from_time["hour"], minute=from_time["minute"])
-    to_time_obj = time(hour=to_time["hour"], minute=to_time["minute"])
-
-    to_date_obj = datetime(
-        year=to_date["year"],
-        month=to_date["month"],
-        day=to_date["day"],
-        hour=23,
-        minute=59,
-    )
-
-    while True:
-        available_slots: list[SlotItem] = await client.get_available_slots(
-            location_id,
-            specialization_id,
-            from_date_obj,
-            doctor_id,
-            clinic_id,
-        )
-        parsed_available_slot = []
-
-        for slot in available_slots:
-            appointment_date = datetime.fromisoformat(slot["appointmentDate"])
-            if from_time_obj <= appointment_date.time() <= to_time_obj and appointment_date <= to_date_obj:
-                parsed_available_slot.append(slot)
-
-        if parsed_available_slot:
-            for slot in parsed_available_slot:
-                await query_message.reply_text(_("A new appointment has been found.", user_data["language"]))
-
-                # TODO fix the translation
-                await query_message.reply_text(
-                    f"Lekarz: {slot["doctor"]["name"]}\n"
-                    f"Klinika: {slot["clinic"]["name"]}\n"
-                    f"Data: {slot["appointmentDate"]}"
-                )
-            break
-        logger.info("No slots available for given parameters. Trying again in 30 seconds...")
-        await asyncio.sleep(30)
-
-
 async def read_create_monitoring(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     chat = cast(Chat, update.effective_chat)
     user_chat_id = chat.id
+    user = cast(User, update.effective_user)
 
     query = cast(CallbackQuery, update.callback_query)
     query_message = cast(Message, query.message)
@@ -1096,9 +1008,11 @@ async def read_create_monitoring(update: Update, context: ContextTypes.DEFAULT_T
 
     user_data["booking_hashes"][task_hash] = current_booking_number
 
-    context.application.create_task(
-        create_monitoring_task(update, context), update=update, name=f"{user_chat_id}_{task_hash}"
+    record = create_monitor_record(
+        user_chat_id, user.id, current_booking_number, task_hash, auto_book=data == AUTO_BOOK_ANSWER
     )
+    user_data.setdefault("monitors", {})[task_hash] = record
+    schedule_monitor(create_monitor(context.application, user_data, record))
 
     await query_message.reply_text(_("Monitoring has been set up.", user_data["language"]))
 
@@ -2,10 +2,12 @@ import os
 from typing import Literal, cast
 
 from dotenv import load_dotenv
-from telegram import Message, Update
+from telegram import Chat, Message, Update, User
 from telegram.ext import ContextTypes, ConversationHandler
 
 from src.locale_handler import SUPPORTED_LANGUAGES, _
+from src.monitoring.scheduler import monitor_scheduler
+from src.telegram_interface.sessions import medicover_clients
 from src.telegram_interface.user_data import UserDataDataclass
 
 load_dotenv()
@@ -14,17 +16,23 @@ load_dotenv()
 async def start_entrypoint(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     user_data = cast(UserDataDataclass, context.user_data)
     update_message = cast(Message, update.message)
+    chat = cast(Chat, update.effective_chat)
+    user = cast(User, update.effective_user)
 
     default_language = os.environ["DEFAULT_LANGUAGE"]
     if default_language not in SUPPORTED_LANGUAGES:
         await update_message.reply_text("Default language is not supported.")
         return ConversationHandler.END
 
-    user_data["medicover_client"] = None
+    user_data["medicover_session"] = None
+    await medicover_clients.remove(user.id)
     user_data["history"] = {"locations": [], "specializations": [], "clinics": {}, "doctors": {}, "temp_data": {}}
     user_data["bookings"] = {}
     user_data["current_booking_number"] = 0
     user_data["booking_hashes"] = {}
+    user_data["monitors"] = {}
+    for monitor in monitor_scheduler.monitors_for(chat.id):
+        monitor_scheduler.unregister(monitor.chat_id, monitor.monitor_id)
     user_data["language"] = cast(Literal["en", "pl"], default_language)
     user_data["username"] = ""
     user_data["password"] = ""
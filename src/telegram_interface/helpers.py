@@ -1,15 +1,17 @@
 from calendar import monthrange
-from datetime import date, datetime
+from datetime import date, datetime, time
 from typing import Literal
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Message
 
 from src.locale_handler import _
 from src.medicover_client.client import FilterDataType
+from src.medicover_client.slots import Slot, SlotQuery, SlotWindow
 from src.telegram_interface.user_data import UserDataDataclass
 
 YES_ANSWER = "yes"
 NO_ANSWER = "no"
+AUTO_BOOK_ANSWER = "auto_book"
 DATE_INCREMENT = 1
 MINUTE_INCREMENT = 15
 HOUR_INCREMENT = 1
@@ -304,6 +306,44 @@ def get_summary_text(user_data: UserDataDataclass, booking_number: int | None =
     return summary_text
 
 
+def get_slot_text(slot: Slot) -> str:
+    # TODO fix the translation
+    return (
+        f"Lekarz: {slot.doctor_name}\n"
+        f"Klinika: {slot.clinic_name}\n"
+        f"Data: {slot.appointment_date.strftime("%H:%M %d-%m-%Y")}"
+    )
+
+
+def get_slot_search(user_data: UserDataDataclass, booking_number: int | None = None) -> tuple[SlotQuery, SlotWindow]:
+    if booking_number is None:
+        booking_number = user_data["current_booking_number"]
+
+    booking = user_data["bookings"][booking_number]
+    from_date = booking["from_date"]
+    from_time = booking["from_time"]
+    to_date = booking["to_date"]
+    to_time = booking["to_time"]
+
+    to_date_obj = date(year=to_date["year"], month=to_date["month"], day=to_date["day"])
+
+    slot_query = SlotQuery(
+        region_id=booking["location"]["location_id"],
+        specialization_id=booking["specialization"]["specialization_id"],
+        from_date=date(year=from_date["year"], month=from_date["month"], day=from_date["day"]),
+        clinic_id=booking["clinic"]["clinic_id"],
+        doctor_id=booking["doctor"]["doctor_id"],
+        to_date=to_date_obj,
+    )
+    slot_window = SlotWindow(
+        to_date=to_date_obj,
+        from_time=time(hour=from_time["hour"], minute=from_time["minute"]),
+        to_time=time(hour=to_time["hour"], minute=to_time["minute"]),
+    )
+
+    return slot_query, slot_window
+
+
 async def prepare_summary(user_data: UserDataDataclass, update_message: Message) -> None:
     summary_text = get_summary_text(user_data)
 
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from datetime import date
+from typing import Any, cast
+
+from telegram.ext import Application
+
+from src.monitoring.scheduler import monitor_scheduler
+from src.telegram_interface.user_data import Bookings, UserDataDataclass
+
+logger = logging.getLogger(__name__)
+
+SWEEP_INTERVAL = 60 * 60.0
+MAX_HISTORY_ITEMS = 10
+
+
+def booking_start_date(booking: Bookings) -> date | None:
+    from_date = booking.get("from_date")
+    return date(year=from_date["year"], month=from_date["month"], day=from_date["day"]) if from_date else None
+
+
+def booking_end_date(booking: Bookings) -> date | None:
+    to_date = booking.get("to_date")
+    return date(year=to_date["year"], month=to_date["month"], day=to_date["day"]) if to_date else None
+
+
+def is_expired(booking: Bookings, today: date) -> bool:
+    end_date = booking_end_date(booking)
+    return end_date is not None and end_date < today
+
+
+def remember_recent(items: list[Any], item: Any, max_items: int = MAX_HISTORY_ITEMS) -> None:
+    """Moves ``item`` to the end of a recent-searches list, dropping the least recently used beyond ``max_items``."""
+    if item in items:
+        items.remove(item)
+    items.append(item)
+    del items[:-max_items]
+
+
+def retire_expired_monitors(user_data: UserDataDataclass, today: date) -> int:
+    monitors = user_data.get("monitors") or {}
+    bookings = user_data.get("bookings") or {}
+    expired = [
+        record
+        for record in monitors.values()
+        if record["booking_number"] not in bookings or is_expired(bookings[record["booking_number"]], today)
+    ]
+    for record in expired:
+        del monitors[record["monitor_id"]]
+        monitor_scheduler.unregister(record["chat_id"], record["monitor_id"])
+    return len(expired)
+
+
+def compact_user_data(user_data: UserDataDataclass) -> int:
+    """Drops bookings and booking hashes no live monitor refers to and trims the search history.
+
+    Returns the number of removed bookings.
+    """
+    monitors = user_data.get("monitors") or {}
+    live_booking_numbers = {record["booking_number"] for record in monitors.values()}
+    live_booking_numbers.add(user_data.get("current_booking_number", 0))
+
+    bookings = user_data.get("bookings") or {}
+    stale_booking_numbers = [number for number in bookings if number not in live_booking_numbers]
+    for number in stale_booking_numbers:
+        del bookings[number]
+
+    booking_hashes = user_data.get("booking_hashes") or {}
+    for booking_hash in [booking_hash for booking_hash in booking_hashes if booking_hash not in monitors]:
+        del booking_hashes[booking_hash]
+
+    history = user_data.get("history")
+    if history:
+        del history["locations"][:-MAX_HISTORY_ITEMS]
+        del history["specializations"][:-MAX_HISTORY_ITEMS]
+        for recent_clinics in history["clinics"].values():
+            del recent_clinics[:-MAX_HISTORY_ITEMS]
+        for recent_doctors in history["doctors"].values():
+            del recent_doctors[:-MAX_HISTORY_ITEMS]
+
+    return len(stale_booking_numbers)
+
+
+class LifecycleManager:
+    """Periodically retires monitors whose window has closed and compacts the per-user records they leave behind.
+
+    Persisted state then grows with the number of live monitors rather than with every monitor ever created. The bot
+    also calls ``sweep`` once on startup, before persisted monitors are resumed.
+    """
+
+    def __init__(self, sweep_interval: float = SWEEP_INTERVAL) -> None:
+        self.sweep_interval = sweep_interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self, application: Application[Any, Any, Any, Any, Any, Any]) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(application), name="monitor-lifecycle")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def sweep(self, application: Application[Any, Any, Any, Any, Any, Any]) -> None:
+        today = date.today()
+        retired = compacted = 0
+        for user_id, data in application.user_data.items():
+            user_data = cast(UserDataDataclass, data)
+            user_retired = retire_expired_monitors(user_data, today)
+            user_compacted = compact_user_data(user_data)
+            if user_retired or user_compacted:
+                application.mark_data_for_update_persistence(user_ids=user_id)
+            retired += user_retired
+            compacted += user_compacted
+
+        logger.info("Lifecycle sweep retired %s monitors and removed %s stale bookings.", retired, compacted)
+
+    async def _run(self, application: Application[Any, Any, Any, Any, Any, Any]) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                self.sweep(application)
+            except Exception:
+                logger.exception("Lifecycle sweep failed.")
+
+
+lifecycle_manager = LifecycleManager()
@@ -0,0 +1,196 @@
+import logging
+import time
+from collections.abc import Callable
+from datetime import date, datetime
+from typing import Any, cast
+
+from telegram.ext import Application
+
+from src.locale_handler import _
+from src.medicover_client.client import MedicoverClient
+from src.medicover_client.coalescer import slot_query_coalescer
+from src.medicover_client.slots import SlotQuery, demultiplex_slots
+from src.monitoring.booking import book_first_available
+from src.monitoring.churn import query_churn_tracker
+from src.monitoring.fairness import priority_policy
+from src.monitoring.routing import Route, routing_index
+from src.monitoring.scheduler import Monitor, MonitorKey, monitor_scheduler
+from src.monitoring.seen import SeenSlots
+from src.telegram_interface.helpers import get_slot_search, get_slot_text
+from src.telegram_interface.sessions import medicover_clients
+from src.telegram_interface.user_data import MonitorRecord, UserDataDataclass
+
+logger = logging.getLogger(__name__)
+
+RESUME_WARM_UP = 60.0
+MAX_SLOTS_PER_MESSAGE = 10
+
+RouteSearch = tuple[MedicoverClient, SlotQuery, float]
+
+# How each monitor would search for its route today, or None when it would not search at all.
+route_searches: dict[MonitorKey, Callable[[date], RouteSearch | None]] = {}
+
+
+def create_monitor_record(
+    chat_id: int, user_id: int, booking_number: int, monitor_id: str, auto_book: bool = False
+) -> MonitorRecord:
+    return MonitorRecord(
+        monitor_id=monitor_id,
+        chat_id=chat_id,
+        user_id=user_id,
+        booking_number=booking_number,
+        created_at=datetime.now().isoformat(),
+        seen=SeenSlots(),
+        auto_book=auto_book,
+    )
+
+
+def route_interval(route: Route, today: date) -> float:
+    """Interval of the most frequently polled monitor on ``route``, which decides how often the route is fetched.
+
+    Every other monitor on the route polls less often and reuses the latest route response while it is younger than
+    this, so the route costs one upstream request per interval however its monitors' polls are spread.
+    """
+    priority = max((priority_policy.priority_for(from_date, today) for from_date in route.from_dates), default=1.0)
+    return query_churn_tracker.interval_for(route.query(today), priority)
+
+
+def create_monitor(
+    application: Application[Any, Any, Any, Any, Any, Any], user_data: UserDataDataclass, record: MonitorRecord
+) -> Monitor:
+    slot_query, slot_window = get_slot_search(user_data, record["booking_number"])
+    seen = record.setdefault("seen", SeenSlots())
+    key = (record["chat_id"], record["monitor_id"])
+    route = routing_index.add(key, slot_query)
+
+    def plan_search(today: date) -> RouteSearch | None:
+        if slot_query.to_date is not None and slot_query.to_date < today:
+            return None
+        client = medicover_clients.get(record["user_id"], user_data)
+        current_route = routing_index.route_for(key)
+        if client is None or current_route is None:
+            return None
+        return client, current_route.query(today), route_interval(current_route, today)
+
+    route_searches[key] = plan_search
+
+    async def poll(monitor: Monitor) -> bool:
+        today = date.today()
+        if slot_query.to_date is not None and slot_query.to_date < today:
+            await application.bot.send_message(
+                monitor.chat_id, _("Monitoring has expired and has been removed.", user_data["language"])
+            )
+            user_data["monitors"].pop(monitor.monitor_id, None)
+            application.mark_data_for_update_persistence(user_ids=record["user_id"])
+            return True
+
+        client = medicover_clients.get(record["user_id"], user_data)
+        if client is None:
+            logger.warning(
+                "Skipping monitor %s of user %s without a Medicover session.", monitor.monitor_id, record["user_id"]
+            )
+            return False
+
+        # Routes merge and split as broader queries come and go, so the route is looked up on every poll. It may
+        # search more broadly than this monitor, whose own query narrows the shared response down.
+        current_route = routing_index.route_for(monitor.key) or routing_index.add(monitor.key, slot_query)
+        route_query = current_route.query(today)
+        route_slots = await slot_query_coalescer.get_available_slots(
+            client, route_query, slot_window, max_age=route_interval(current_route, today)
+        )
+        parsed_available_slot = demultiplex_slots(route_slots, (slot_query,))[slot_query]
+        monitor.priority = priority_policy.priority_for(slot_query.from_date, today)
+        monitor.interval = query_churn_tracker.interval_for(route_query, monitor.priority)
+
+        new_slots = seen.filter_new(parsed_available_slot)
+        if not new_slots:
+            logger.info("No new slots for monitor %s, next poll in %.0f seconds.", monitor.monitor_id, monitor.interval)
+            return False
+        matched_at = time.perf_counter()
+
+        if record.get("auto_book"):
+            booked_slot = await book_first_available(client, new_slots, matched_at)
+            if booked_slot is not None:
+                await application.bot.send_message(
+                    monitor.chat_id, _("The appointment has been booked automatically.", user_data["language"])
+                )
+                await application.bot.send_message(monitor.chat_id, get_slot_text(booked_slot))
+                user_data["monitors"].pop(monitor.monitor_id, None)
+                application.mark_data_for_update_persistence(user_ids=record["user_id"])
+                return True
+
+        # Slots count as seen only once their message went out, so a failed send is retried on the next poll.
+        for start in range(0, len(new_slots), MAX_SLOTS_PER_MESSAGE):
+            batch = new_slots[start : start + MAX_SLOTS_PER_MESSAGE]
+            header = (
+                _("A new appointment has been found.", user_data["language"])
+                if len(batch) == 1
+                else _("New appointments have been found.", user_data["language"])
+            )
+            await application.bot.send_message(monitor.chat_id, "\n\n".join([header, *map(get_slot_text, batch)]))
+            seen.mark_seen(batch)
+            application.mark_data_for_update_persistence(user_ids=record["user_id"])
+        return False
+
+    today = date.today()
+    priority = priority_policy.priority_for(slot_query.from_date, today)
+    return Monitor(
+        record["chat_id"],
+        record["monitor_id"],
+        poll,
+        query_churn_tracker.interval_for(route.query(today), priority),
+        priority,
+    )
+
+
+def schedule_monitor(monitor: Monitor) -> None:
+    """Registers a new monitor in step with another monitor on its route, so their polls share one request."""
+    route = routing_index.route_for(monitor.key)
+    peer = next((key for key in route.members if key != monitor.key), None) if route is not None else None
+    delay = monitor_scheduler.due_in(peer) if peer is not None else None
+    monitor_scheduler.register(monitor, delay=delay or 0.0)
+
+
+def forget_monitor(monitor: Monitor) -> None:
+    routing_index.remove(monitor.key)
+    route_searches.pop(monitor.key, None)
+
+
+def search_due_routes(monitors: list[Monitor]) -> None:
+    """Starts the route searches of monitors that fell due together before they poll.
+
+    The routes searched with one account are packed into as few upstream requests as possible, and the polls then
+    join those searches or reuse their responses. Routes with a response young enough to be reused are skipped.
+    """
+    today = date.today()
+    by_account: dict[str, tuple[MedicoverClient, list[SlotQuery]]] = {}
+    for monitor in monitors:
+        plan_search = route_searches.get(monitor.key)
+        search = plan_search(today) if plan_search is not None else None
+        if search is None:
+            continue
+        client, query, max_age = search
+        if not slot_query_coalescer.has_fresh_response(query, max_age):
+            by_account.setdefault(client.username, (client, []))[1].append(query)
+
+    for client, queries in by_account.values():
+        # A single route gains nothing from packing and is searched by its own poll.
+        if len(set(queries)) > 1:
+            slot_query_coalescer.search_together(client, queries)
+
+
+def resume_monitors(application: Application[Any, Any, Any, Any, Any, Any]) -> int:
+    """Registers every persisted monitor again, spreading their first polls over the warm-up window."""
+    monitors = []
+    for user_id, data in application.user_data.items():
+        user_data = cast(UserDataDataclass, data)
+        records = user_data.get("monitors") or {}
+        if records and user_data.get("medicover_session") is None:
+            logger.warning("Skipping %s monitors of user %s without a Medicover session.", len(records), user_id)
+            continue
+
+        monitors += [create_monitor(application, user_data, record) for record in records.values()]
+
+    monitor_scheduler.register_staggered(monitors, RESUME_WARM_UP)
+    logger.info("Resumed %s monitors.", len(monitors))
+    return len(monitors)
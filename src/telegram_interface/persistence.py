@@ -0,0 +1,274 @@
+import asyncio
+import json
+import logging
+import pickle
+import sqlite3
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, TypeVar
+
+from telegram.ext import BasePersistence, PersistenceInput, PicklePersistence
+from telegram.ext._utils.types import CDCData, ConversationDict, ConversationKey
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+SCHEMA_VERSION = 1
+WRITE_DELAY = 0.05
+MIN_RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 60.0
+MIGRATION_MARKER = "migrated_from"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_data (id INTEGER PRIMARY KEY, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS chat_data (id INTEGER PRIMARY KEY, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS conversations (name TEXT NOT NULL, key TEXT NOT NULL, data BLOB NOT NULL,
+    PRIMARY KEY (name, key));
+CREATE TABLE IF NOT EXISTS singletons (name TEXT PRIMARY KEY, data BLOB NOT NULL);
+"""
+
+KEY_COLUMNS = {
+    "user_data": ("id",),
+    "chat_data": ("id",),
+    "conversations": ("name", "key"),
+    "singletons": ("name",),
+}
+
+Data = dict[Any, Any]
+RowKey = tuple[str, tuple[Any, ...]]
+
+# Marks a pending row that has to be deleted rather than written.
+DELETED = object()
+
+
+class SQLitePersistence(BasePersistence[Data, Data, Data]):
+    """Stores every user, chat and conversation as its own row of an SQLite database in WAL mode.
+
+    ``update_*`` calls only queue the changed rows; a background writer pickles everything queued within
+    ``write_delay`` seconds and writes it in one transaction on a dedicated thread, so a flush costs time in the
+    number of changed users rather than in the size of the whole state. Rows are pickled on the event loop, because
+    handlers keep changing the same dicts there, and only the bytes go to the thread. A failed write is retried with
+    exponential backoff, and ``flush`` writes whatever is still queued itself. When ``migrate_from`` points to the
+    pickle file of a ``PicklePersistence``, its contents are imported once on the first start.
+    """
+
+    def __init__(
+        self,
+        filepath: Path | str,
+        migrate_from: Path | str | None = None,
+        store_data: PersistenceInput | None = None,
+        update_interval: float = 60,
+        write_delay: float = WRITE_DELAY,
+    ) -> None:
+        super().__init__(store_data=store_data, update_interval=update_interval)
+        self.filepath = Path(filepath)
+        self.migrate_from = Path(migrate_from) if migrate_from is not None else None
+        self.write_delay = write_delay
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-persistence")
+        self._connection: sqlite3.Connection | None = None
+        self._pending: dict[RowKey, Any] = {}
+        self._writer: asyncio.Task[None] | None = None
+        self._load_task: asyncio.Task[None] | None = None
+        self._user_data: dict[int, Data] = {}
+        self._chat_data: dict[int, Data] = {}
+        self._bot_data: Data = {}
+        self._callback_data: CDCData | None = None
+        self._conversations: dict[str, dict[ConversationKey, object]] = {}
+
+    async def get_user_data(self) -> dict[int, Data]:
+        await self._load()
+        return self._user_data
+
+    async def get_chat_data(self) -> dict[int, Data]:
+        await self._load()
+        return self._chat_data
+
+    async def get_bot_data(self) -> Data:
+        await self._load()
+        return self._bot_data
+
+    async def get_callback_data(self) -> CDCData | None:
+        await self._load()
+        return self._callback_data
+
+    async def get_conversations(self, name: str) -> ConversationDict:
+        await self._load()
+        return dict(self._conversations.get(name, {}))
+
+    async def update_conversation(self, name: str, key: ConversationKey, new_state: object | None) -> None:
+        row_key = ("conversations", (name, json.dumps(key)))
+        self._enqueue(row_key, DELETED if new_state is None else new_state)
+
+    async def update_user_data(self, user_id: int, data: Data) -> None:
+        self._enqueue(("user_data", (user_id,)), data)
+
+    async def update_chat_data(self, chat_id: int, data: Data) -> None:
+        self._enqueue(("chat_data", (chat_id,)), data)
+
+    async def update_bot_data(self, data: Data) -> None:
+        self._enqueue(("singletons", ("bot_data",)), data)
+
+    async def update_callback_data(self, data: CDCData) -> None:
+        self._enqueue(("singletons", ("callback_data",)), data)
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        self._enqueue(("chat_data", (chat_id,)), DELETED)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        self._enqueue(("user_data", (user_id,)), DELETED)
+
+    async def refresh_user_data(self, user_id: int, user_data: Data) -> None:
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: Data) -> None:
+        pass
+
+    async def refresh_bot_data(self, bot_data: Data) -> None:
+        pass
+
+    async def drain(self) -> None:
+        """Waits until every queued row has been written."""
+        while self._writer is not None and not self._writer.done():
+            await asyncio.shield(self._writer)
+
+    async def flush(self) -> None:
+        if self._writer is not None and not self._writer.done():
+            # The writer may be backing off after a failure; whatever it has not written is written right here.
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+
+        try:
+            if self._pending:
+                batch, self._pending = self._pending, {}
+                try:
+                    await self._run(self._write_rows, self._serialize(batch))
+                except Exception as error:
+                    raise RuntimeError(f"{len(batch)} rows could not be written to {self.filepath}.") from error
+        finally:
+            if self._connection is not None:
+                await self._run(self._connection.close)
+                self._connection = None
+            self._executor.shutdown()
+
+    def _enqueue(self, row_key: RowKey, data: object) -> None:
+        # A row changed again before it was written is written once, with its latest data.
+        self._pending[row_key] = data
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._write_pending(), name="sqlite-persistence")
+
+    async def _write_pending(self) -> None:
+        # Give the rest of an update_persistence run the chance to join this batch.
+        await asyncio.sleep(self.write_delay)
+        retry_delay = MIN_RETRY_DELAY
+        while self._pending:
+            batch, self._pending = self._pending, {}
+            try:
+                await self._run(self._write_rows, self._serialize(batch))
+            except asyncio.CancelledError:
+                # Rows changed again in the meantime keep their newer data.
+                self._pending = batch | self._pending
+                raise
+            except Exception:
+                logger.exception(
+                    "Writing %s rows to %s failed, retrying in %s seconds.", len(batch), self.filepath, retry_delay
+                )
+                self._pending = batch | self._pending
+                await asyncio.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, MAX_RETRY_DELAY)
+            else:
+                retry_delay = MIN_RETRY_DELAY
+
+    @staticmethod
+    def _serialize(rows: dict[RowKey, Any]) -> dict[RowKey, Any]:
+        return {
+            row_key: data if data is DELETED else pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            for row_key, data in rows.items()
+        }
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _load(self) -> None:
+        # The application calls several getters on startup; the database is read only once.
+        if self._load_task is None:
+            self._load_task = asyncio.get_running_loop().create_task(self._load_all())
+        await asyncio.shield(self._load_task)
+
+    async def _load_all(self) -> None:
+        await self._run(self._open)
+        if self.migrate_from is not None and self.migrate_from.exists() and not await self._run(self._is_migrated):
+            await self._migrate(self.migrate_from)
+        await self._run(self._read_all)
+
+    async def _migrate(self, pickle_path: Path) -> None:
+        pickle_persistence: PicklePersistence[Data, Data, Data] = PicklePersistence(
+            pickle_path, store_data=self.store_data
+        )
+        pickle_persistence.set_bot(self.bot)
+        user_data = await pickle_persistence.get_user_data() or {}
+        chat_data = await pickle_persistence.get_chat_data() or {}
+        bot_data = await pickle_persistence.get_bot_data()
+        callback_data = await pickle_persistence.get_callback_data()
+
+        rows: dict[RowKey, Any] = {("user_data", (user_id,)): data for user_id, data in user_data.items()}
+        rows |= {("chat_data", (chat_id,)): data for chat_id, data in chat_data.items()}
+        rows[("singletons", ("bot_data",))] = bot_data
+        if callback_data is not None:
+            rows[("singletons", ("callback_data",))] = callback_data
+        for name, conversations in (pickle_persistence.conversations or {}).items():
+            rows |= {("conversations", (name, json.dumps(key))): state for key, state in conversations.items()}
+        rows[("singletons", (MIGRATION_MARKER,))] = str(pickle_path)
+
+        await self._run(self._write_rows, self._serialize(rows))
+        logger.info("Migrated %s users and %s chats from %s.", len(user_data), len(chat_data), pickle_path)
+
+    def _open(self) -> None:
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.filepath, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        # A new database reports version 0. Any other version than ours was written by a different release.
+        (schema_version,) = connection.execute("PRAGMA user_version").fetchone()
+        if schema_version not in (0, SCHEMA_VERSION):
+            connection.close()
+            raise RuntimeError(
+                f"{self.filepath} has persistence schema version {schema_version}, expected {SCHEMA_VERSION}."
+            )
+        connection.executescript(SCHEMA)
+        connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._connection = connection
+
+    def _is_migrated(self) -> bool:
+        return bool(self._select(f"SELECT 1 FROM singletons WHERE name = '{MIGRATION_MARKER}'"))
+
+    def _read_all(self) -> None:
+        self._user_data = {user_id: pickle.loads(data) for user_id, data in self._select("SELECT * FROM user_data")}
+        self._chat_data = {chat_id: pickle.loads(data) for chat_id, data in self._select("SELECT * FROM chat_data")}
+
+        singletons = {name: pickle.loads(data) for name, data in self._select("SELECT * FROM singletons")}
+        self._bot_data = singletons.get("bot_data", {})
+        self._callback_data = singletons.get("callback_data")
+
+        self._conversations = {}
+        for name, key, data in self._select("SELECT * FROM conversations"):
+            self._conversations.setdefault(name, {})[tuple(json.loads(key))] = pickle.loads(data)
+
+    def _select(self, query: str) -> list[tuple[Any, ...]]:
+        if self._connection is None:
+            raise RuntimeError("The persistence database is not open.")
+        return self._connection.execute(query).fetchall()
+
+    def _write_rows(self, rows: dict[RowKey, Any]) -> None:
+        """Writes rows already pickled by ``_serialize``, so the thread never touches objects the loop may change."""
+        if self._connection is None:
+            raise RuntimeError("The persistence database is not open.")
+        with self._connection:
+            for (table, key), data in rows.items():
+                if data is DELETED:
+                    condition = " AND ".join(f"{column} = ?" for column in KEY_COLUMNS[table])
+                    self._connection.execute(f"DELETE FROM {table} WHERE {condition}", key)
+                else:
+                    placeholders = ", ".join("?" * (len(key) + 1))
+                    self._connection.execute(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", (*key, data))
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import date
+from typing import Any, cast
+
+from telegram import Update, User
+from telegram.ext import Application, ContextTypes
+
+from src.medicover_client.budget import RequestBudget
+from src.medicover_client.client import MedicoverClient
+from src.medicover_client.exceptions import UnsupportedSessionError
+from src.monitoring.fairness import priority_policy
+from src.telegram_interface.lifecycle import booking_start_date
+from src.telegram_interface.user_data import UserDataDataclass
+
+logger = logging.getLogger(__name__)
+
+
+def login_priority(user_data: UserDataDataclass, today: date) -> float:
+    """The highest priority among the user's monitors, so users whose windows open soon are signed in first."""
+    bookings = user_data.get("bookings") or {}
+    start_dates = [
+        booking_start_date(bookings[record["booking_number"]])
+        for record in (user_data.get("monitors") or {}).values()
+        if record["booking_number"] in bookings
+    ]
+    return max(
+        (priority_policy.priority_for(start_date, today) for start_date in start_dates if start_date is not None),
+        default=1.0,
+    )
+
+
+class ClientRegistry:
+    """Live ``MedicoverClient`` objects of the users, rebuilt on demand from the session records in their user data.
+
+    Only the compact session record is persisted. A client is created from it the first time the user needs one and
+    keeps its connection pool until the user logs out or the bot stops. Its login priority follows the user's
+    monitors, so queued background sign-ins favour users whose windows open soon. Whenever a client gets a new token,
+    its session record is rewritten and ``session_listeners`` are told which user has to be persisted again.
+    With a ``budget`` set, every client it creates counts its upstream requests against that budget.
+    """
+
+    def __init__(self) -> None:
+        self.session_listeners: list[Callable[[int], None]] = []
+        self.budget: RequestBudget | None = None
+        self._clients: dict[int, MedicoverClient] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, user_id: int, user_data: UserDataDataclass) -> MedicoverClient | None:
+        session = user_data.get("medicover_session")
+        if session is None:
+            return None
+
+        client = self._clients.get(user_id)
+        if client is None or client.session_id != session["session_id"]:
+            if client is not None:
+                # The record was replaced, so the old client's pool and token refresher must not outlive it.
+                self._close_later(self._clients.pop(user_id))
+            try:
+                client = MedicoverClient.from_session(session, self.budget)
+            except UnsupportedSessionError:
+                logger.warning("Dropping an unsupported Medicover session of user %s.", user_id)
+                user_data["medicover_session"] = None
+                return None
+            self._track(user_id, user_data, client)
+
+        client.login_priority = login_priority(user_data, date.today())
+        return client
+
+    async def set(self, user_id: int, user_data: UserDataDataclass, client: MedicoverClient) -> None:
+        await self.remove(user_id)
+        user_data["medicover_session"] = client.to_session()
+        self._track(user_id, user_data, client)
+
+    async def remove(self, user_id: int) -> None:
+        client = self._clients.pop(user_id, None)
+        if client is not None:
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        for user_id in list(self._clients):
+            await self.remove(user_id)
+        await asyncio.gather(*self._closing, return_exceptions=True)
+
+    def _close_later(self, client: MedicoverClient) -> None:
+        task = asyncio.get_running_loop().create_task(client.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _track(self, user_id: int, user_data: UserDataDataclass, client: MedicoverClient) -> None:
+        def save_session(client: MedicoverClient) -> None:
+            if self._clients.get(user_id) is not client:
+                return
+            user_data["medicover_session"] = client.to_session()
+            for listener in self.session_listeners:
+                listener(user_id)
+
+        client.token_listeners.append(save_session)
+        self._clients[user_id] = client
+
+
+def upgrade_legacy_clients(application: Application[Any, Any, Any, Any, Any, Any]) -> int:
+    """Replaces pickled ``MedicoverClient`` objects left in user data by older versions with session records."""
+    upgraded = 0
+    for user_id, data in application.user_data.items():
+        legacy_client = data.pop("medicover_client", None)
+        if legacy_client is None:
+            continue
+        data["medicover_session"] = cast(MedicoverClient, legacy_client).to_session()
+        application.mark_data_for_update_persistence(user_ids=user_id)
+        upgraded += 1
+
+    if upgraded:
+        logger.info("Replaced %s persisted Medicover clients with session records.", upgraded)
+    return upgraded
+
+
+def get_medicover_client(update: Update, context: ContextTypes.DEFAULT_TYPE) -> MedicoverClient | None:
+    user = cast(User, update.effective_user)
+    return medicover_clients.get(user.id, cast(UserDataDataclass, context.user_data))
+
+
+medicover_clients = ClientRegistry()
@@ -1,6 +1,7 @@
 from typing import Literal, TypedDict
 
-from src.medicover_client.client import MedicoverClient
+from src.medicover_client.session import MedicoverSession
+from src.monitoring.seen import SeenSlots
 
 
 class Location(TypedDict):
@@ -57,12 +58,23 @@ class Bookings(TypedDict, total=False):
     message_id: int
 
 
+class MonitorRecord(TypedDict):
+    monitor_id: str
+    chat_id: int
+    user_id: int
+    booking_number: int
+    created_at: str
+    seen: SeenSlots
+    auto_book: bool
+
+
 class UserDataDataclass(TypedDict):
-    medicover_client: MedicoverClient | None
+    medicover_session: MedicoverSession | None
     history: UserDataHistory
     bookings: dict[int, Bookings]
     current_booking_number: int
     booking_hashes: dict[str, int]
+    monitors: dict[str, MonitorRecord]
     language: Literal["en", "pl"]
     username: str
     password: str
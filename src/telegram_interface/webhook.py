@@ -0,0 +1,60 @@
+import logging
+import os
+import secrets
+from typing import TypedDict
+from urllib.parse import urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEBHOOK_LISTEN = "0.0.0.0"
+DEFAULT_WEBHOOK_PORT = 8443
+
+
+class WebhookSettings(TypedDict):
+    listen: str
+    port: int
+    url_path: str
+    webhook_url: str
+    secret_token: str
+    cert: str | None
+    key: str | None
+
+
+def webhook_settings_from_env() -> WebhookSettings | None:
+    """Webhook delivery settings, or None to keep long polling when ``TELEGRAM_WEBHOOK_URL`` is not set.
+
+    ``TELEGRAM_WEBHOOK_URL`` is the public address Telegram posts updates to, either of a reverse proxy forwarding
+    to the bot or of the bot itself serving TLS with the self-signed ``TELEGRAM_WEBHOOK_CERT`` and
+    ``TELEGRAM_WEBHOOK_KEY``. The bot listens on the same path. Without ``TELEGRAM_WEBHOOK_SECRET_TOKEN`` a random
+    secret is used, which only works for a single instance; workers sharing one ingress need the same secret.
+    """
+    webhook_url = os.getenv("TELEGRAM_WEBHOOK_URL")
+    if not webhook_url:
+        return None
+
+    secret_token = os.getenv("TELEGRAM_WEBHOOK_SECRET_TOKEN")
+    if not secret_token:
+        logger.warning("TELEGRAM_WEBHOOK_SECRET_TOKEN is not set, using a random secret token.")
+        secret_token = secrets.token_urlsafe(32)
+
+    return WebhookSettings(
+        listen=os.getenv("TELEGRAM_WEBHOOK_LISTEN", DEFAULT_WEBHOOK_LISTEN),
+        port=int(os.getenv("TELEGRAM_WEBHOOK_PORT", DEFAULT_WEBHOOK_PORT)),
+        url_path=urlsplit(webhook_url).path.lstrip("/"),
+        webhook_url=webhook_url,
+        secret_token=secret_token,
+        cert=os.getenv("TELEGRAM_WEBHOOK_CERT") or None,
+        key=os.getenv("TELEGRAM_WEBHOOK_KEY") or None,
+    )
+
+
+def file_base_url(api_base_url: str) -> str:
+    """The file download URL served next to a Bot API base URL, e.g. ``http://botapi:8081/file/bot``.
+
+    Only the trailing ``/bot`` of the path is rewritten, so a host name starting with "bot" is left alone.
+    """
+    scheme, netloc, path, query, fragment = urlsplit(api_base_url)
+    root, separator, rest = path.rpartition("/bot")
+    if not separator or rest:
+        raise ValueError(f"TELEGRAM_API_BASE_URL must end with /bot, got {api_base_url!r}.")
+    return urlunsplit((scheme, netloc, f"{root}/file/bot", query, fragment))